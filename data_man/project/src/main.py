@@ -1,41 +1,49 @@
 import pandas as pd
 from utils.sqlite_db import (
+    BackgroundWriter,
     create_database,
     ingest_csv_to_db,
     transform_gfg,
     delete_database,
     query_to_df,
 )
-from utils.rss import RSS_FEEDS, ingest_rss_to_db, transform_medium
+from utils.rss import RSS_FEEDS, ingest_rss_feeds_to_db, transform_medium
 from utils.dq import dq_pandera, extract_failed_records_general
 from utils.dimensions import staging_to_dim_articles_gfg, staging_to_dim_articles_medium
 
 
+# Arrow-backed string columns: compact UTF-8 buffers instead of one Python object per value
+pd.options.future.infer_string = True
+
+
 def main() -> None:
     """
     Entry point for the project.
     """
 
     # db setup
-    _= delete_database('data/dg_articles.db')
-    conn = create_database('data/dg_articles.db')
+    db_path = 'data/dg_articles.db'
+    _= delete_database(db_path)
+    conn = create_database(db_path)
 
 
-    # GeeksforGeeks
-    ingest_csv_to_db('data/GeeksforGeeks_articles.csv', conn, 'stg_gfg_articles', transform_gfg)
-    df = query_to_df(conn, 'SELECT * FROM stg_gfg_articles')
-    print(df.head())
+    # Staging ingest: one background thread commits batches while this thread
+    # keeps transforming CSV chunks and fetching RSS feeds; joined on exit
+    with BackgroundWriter(db_path) as writer:
+        # GeeksforGeeks
+        ingest_csv_to_db('data/GeeksforGeeks_articles.csv', conn, 'stg_gfg_articles', transform_gfg, writer=writer)
 
+        # Medium - Fetch all RSS feeds concurrently
+        ingest_rss_feeds_to_db(RSS_FEEDS, conn, 'stg_medium_articles', transform_medium, writer=writer)
 
-    # Medium - Iterate over all RSS feeds
-    for feed in RSS_FEEDS:
-        ingest_rss_to_db(feed, conn, 'stg_medium_articles', transform_medium)
+    df = query_to_df(conn, 'SELECT * FROM stg_gfg_articles')
+    print(df.head())
     df = query_to_df(conn, 'SELECT * FROM stg_medium_articles')
     print(df.head())
 
 
     # DQ checks GeeksforGeeks
-    df_gfg = pd.read_sql("SELECT * FROM stg_gfg_articles WHERE processed = false", conn)
+    df_gfg = pd.read_sql("SELECT * FROM stg_gfg_articles WHERE processed = 0", conn)
     if not df_gfg.empty:
         errors = dq_pandera(df_gfg, "stg_gfg_articles")
         clean_df, quarantined_count = extract_failed_records_general(errors, df_gfg, conn, "stg_gfg_articles", "id")
@@ -48,7 +56,7 @@ def main() -> None:
 
 
     # DQ checks Medium
-    df_medium = pd.read_sql("SELECT * FROM stg_medium_articles WHERE processed = false", conn)
+    df_medium = pd.read_sql("SELECT * FROM stg_medium_articles WHERE processed = 0", conn)
     if not df_medium.empty:
         errors = dq_pandera(df_medium, "stg_medium_articles")
         clean_df, quarantined_count = extract_failed_records_general(errors, df_medium, conn, "stg_medium_articles", "id")
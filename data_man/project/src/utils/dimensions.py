@@ -1,104 +1,157 @@
-import json
+import orjson
+import numpy as np
 import pandas as pd
 import sqlite3
-from typing import Optional
-from utils.sqlite_db import insert_df_to_db
+from utils.sqlite_db import SCHEMAS, create_table, create_indexes, drop_indexes
+
+
+# Above this many rows, dim_articles indexes are dropped and rebuilt around the insert
+INDEX_REBUILD_THRESHOLD = 1000
+
+
+# Column list shared by the staging -> dim_articles loads
+_DIM_COLUMNS = "article_id, source_platform, title, author, pub_date, link, category, is_valid"
+
+# Upsert keeps created_at and refreshes the other fields + updated_at on re-load
+_DIM_UPSERT = """
+    ON CONFLICT(article_id) DO UPDATE SET
+        source_platform = excluded.source_platform,
+        title = excluded.title,
+        author = excluded.author,
+        pub_date = excluded.pub_date,
+        link = excluded.link,
+        category = excluded.category,
+        is_valid = excluded.is_valid,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# Staging table -> SQL-native transform into dim_articles. Rows are selected by the
+# clean staging ids, bound as one JSON array parameter (no per-id placeholders).
+DIM_LOAD_SQL = {
+    'stg_gfg_articles': f"""
+        INSERT INTO dim_articles ({_DIM_COLUMNS})
+        SELECT article_id, 'GFG', title, author_id, substr(last_updated, 1, 10),
+               link, category, 1
+        FROM stg_gfg_articles
+        WHERE id IN (SELECT value FROM json_each(?)) AND processed = 0
+        {_DIM_UPSERT}
+    """,
+    'stg_medium_articles': f"""
+        INSERT INTO dim_articles ({_DIM_COLUMNS})
+        SELECT id_rss, 'Medium', title,
+               -- first author: {{"name": ...}} object or plain string
+               CASE WHEN json_valid(authors) THEN
+                   CASE json_type(authors, '$[0]')
+                       WHEN 'object' THEN json_extract(authors, '$[0].name')
+                       WHEN 'text' THEN json_extract(authors, '$[0]')
+                   END
+               END,
+               published, link,
+               -- first tag: {{"term": ...}} object or plain string
+               CASE WHEN json_valid(tags) THEN
+                   CASE json_type(tags, '$[0]')
+                       WHEN 'object' THEN json_extract(tags, '$[0].term')
+                       WHEN 'text' THEN json_extract(tags, '$[0]')
+                   END
+               END,
+               1
+        FROM stg_medium_articles
+        WHERE id IN (SELECT value FROM json_each(?)) AND processed = 0
+        {_DIM_UPSERT}
+    """,
+}
 
 
 def mark_records_as_processed(conn: sqlite3.Connection, table_name: str, 
-                              pk_col: str, pk_values: list) -> int:
+                              pk_col: str, pk_values) -> int:
     """
     Mark staging records as processed after successful load to dimension table.
     
     Updates processed flag to True (1) for specified primary key values. Only updates
     records that were successfully validated and loaded. Failed/quarantined records
-    remain with processed = False for potential reprocessing.
+    remain with processed = False for potential reprocessing. Does not commit: the
+    caller commits so that the dimension load and the flag update are one transaction.
     
     Args:
         conn: Active SQLite database connection.
         table_name: Name of staging table to update.
         pk_col: Primary key column name (article_id or id_rss).
-        pk_values: List of primary key values to mark as processed.
+        pk_values: List or ndarray of primary key values to mark as processed.
+            Integer ndarrays are bound element by element, without building a list.
         
     Returns:
         Number of records marked as processed.
+
+    Raises:
+        ValueError: If table_name is not a known table or pk_col is not a valid identifier.
+        sqlite3.Error: If the update fails; the caller rolls back the whole load.
     """
-    if not pk_values:
+    # Identifiers cannot be bound as parameters: whitelist them before formatting
+    if table_name not in SCHEMAS or not pk_col.isidentifier():
+        raise ValueError(f"Invalid table/column for processed update: {table_name}.{pk_col}")
+
+    if len(pk_values) == 0:
         print(f"No records to mark as processed in {table_name}")
         return 0
     
-    try:
-        cursor = conn.cursor()
-        
-        # Use parameterized query with IN clause
-        placeholders = ','.join('?' * len(pk_values))
-        update_query = f"""
-            UPDATE {table_name}
-            SET processed = 1
-            WHERE {pk_col} IN ({placeholders})
-        """
-        
-        cursor.execute(update_query, pk_values)
-        conn.commit()
-        
-        rows_updated = cursor.rowcount
-        print(f"Marked {rows_updated} records as processed in {table_name}")
-        return rows_updated
-        
-    except Exception as e:
-        print(f"Error marking records as processed in {table_name}: {e}")
-        conn.rollback()
-        return 0
-
-
-def extract_first_tag(tags_json: str) -> Optional[str]:
-    """
-    Extract first tag name from JSON array string.
+    cursor = conn.cursor()
     
-    Parses JSON array from Medium RSS feed tags field and extracts first tag.
-    Handles both dict format with 'term' key and direct string format.
+    # One prepared statement reused for every key (no IN-list size limit)
+    update_query = f"UPDATE {table_name} SET processed = 1 WHERE {pk_col} = ?"
     
-    Args:
-        tags_json: JSON string containing array of tag objects or strings.
-        
-    Returns:
-        First tag name as string, or None if parsing fails or empty.
-    """
-    try:
-        tags = json.loads(tags_json)
-        if isinstance(tags, list) and len(tags) > 0:
-            if isinstance(tags[0], dict) and 'term' in tags[0]:
-                return tags[0]['term']
-            elif isinstance(tags[0], str):
-                return tags[0]
-    except (json.JSONDecodeError, TypeError, KeyError):
-        pass
-    return None
-
-
-def extract_first_author(authors_json: str) -> Optional[str]:
-    """
-    Extract first author name from JSON array string.
-    
-    Parses JSON array from Medium RSS feed authors field and extracts first author.
-    Handles both dict format with 'name' key and direct string format.
+    # sqlite3 can't bind numpy ints: cast lazily instead of materializing a list
+    if isinstance(pk_values, np.ndarray) and pk_values.dtype.kind in 'iu':
+        params = ((int(v),) for v in pk_values)
+    else:
+        params = ((v,) for v in pk_values)
+    # No local rollback: errors propagate so the caller undoes the load as well
+    cursor.executemany(update_query, params)
     
+    rows_updated = cursor.rowcount
+    print(f"Marked {rows_updated} records as processed in {table_name}")
+    return rows_updated
+
+
+def _load_staging_to_dim(df_clean: pd.DataFrame, conn: sqlite3.Connection,
+                         staging_table: str) -> int:
+    """
+    Load clean staging rows into dim_articles and mark them processed, in one transaction.
+
+    The transform runs inside SQLite (DIM_LOAD_SQL): only the clean ids travel
+    from pandas, the row data never round-trips through a DataFrame.
+
     Args:
-        authors_json: JSON string containing array of author objects or strings.
-        
+        df_clean: Cleaned staging DataFrame (only the 'id' column is used).
+        conn: Active SQLite database connection.
+        staging_table: Source staging table (key of DIM_LOAD_SQL).
+
     Returns:
-        First author name as string, or None if parsing fails or empty.
+        Number of dim_articles rows inserted or updated.
     """
-    try:
-        authors = json.loads(authors_json)
-        if isinstance(authors, list) and len(authors) > 0:
-            if isinstance(authors[0], dict) and 'name' in authors[0]:
-                return authors[0]['name']
-            elif isinstance(authors[0], str):
-                return authors[0]
-    except (json.JSONDecodeError, TypeError, KeyError):
-        pass
-    return None
+    # Ensure dimension table exists with its UNIQUE(article_id) constraint
+    if not create_table(conn, 'dim_articles', SCHEMAS['dim_articles']):
+        raise ValueError("Failed to create dim_articles table")
+
+    loaded_ids = df_clean['id'].to_numpy(dtype=np.int64)
+
+    # One explicit transaction from here to the commit: DDL does not open one
+    # implicitly, and the caller's rollback must also restore dropped indexes
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+    # Bulk loads: rebuild indexes once instead of updating them per row
+    if len(loaded_ids) > INDEX_REBUILD_THRESHOLD:
+        drop_indexes(conn, 'dim_articles')
+    ids_json = orjson.dumps(loaded_ids, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    cursor = conn.execute(DIM_LOAD_SQL[staging_table], (ids_json,))
+    create_indexes(conn, 'dim_articles')
+
+    # Mark successfully loaded records as processed, commit load + flags together
+    _= mark_records_as_processed(conn, staging_table, 'id', loaded_ids)
+    conn.commit()
+
+    print(f"Loaded {cursor.rowcount} rows from {staging_table} into dim_articles")
+    return cursor.rowcount
 
 
 def staging_to_dim_articles_gfg(df_clean: pd.DataFrame, conn: sqlite3.Connection) -> bool:
@@ -116,34 +169,14 @@ def staging_to_dim_articles_gfg(df_clean: pd.DataFrame, conn: sqlite3.Connection
         conn: Active SQLite database connection.
         
     Returns:
-        Number of records successfully inserted/updated in dim_articles.
+        True if the load succeeded, False otherwise (0 if nothing to load).
     """
     if df_clean.empty:
         print("No clean GFG records to load")
         return 0
     
-    # Transform to dim_articles schema
-    dim_df = pd.DataFrame({
-        'article_id': df_clean['article_id'],
-        'source_platform': 'GFG',
-        'title': df_clean['title'],
-        'author': df_clean['author_id'],
-        'pub_date': pd.to_datetime(df_clean['last_updated'], errors='coerce').dt.strftime('%Y-%m-%d'),
-        'link': df_clean['link'],
-        'category': df_clean['category'],
-        'is_valid': 1
-    })
-    
-    # Clean pub_date NaT values
-    dim_df['pub_date'] = dim_df['pub_date'].replace('NaT', None)
-    
-    try:   
-        insert_df_to_db(dim_df, 'dim_articles', conn)
-        
-        # Mark successfully loaded records as processed
-        loaded_ids = df_clean['id'].tolist()
-        _= mark_records_as_processed(conn, 'stg_gfg_articles', 'id', loaded_ids)
-        
+    try:
+        _= _load_staging_to_dim(df_clean, conn, 'stg_gfg_articles')
         return True
         
     except Exception as e:
@@ -167,31 +200,14 @@ def staging_to_dim_articles_medium(df_clean: pd.DataFrame, conn: sqlite3.Connect
         conn: Active SQLite database connection.
         
     Returns:
-        Number of records successfully inserted/updated in dim_articles.
+        True if the load succeeded, False otherwise (0 if nothing to load).
     """
     if df_clean.empty:
         print("No clean Medium records to load")
         return 0
     
-    # Transform to dim_articles schema
-    dim_df = pd.DataFrame({
-        'article_id': df_clean['id_rss'],
-        'source_platform': 'Medium',
-        'title': df_clean['title'],
-        'author': df_clean['authors'].apply(extract_first_author),
-        'pub_date': df_clean['published'],
-        'link': df_clean['link'],
-        'category': df_clean['tags'].apply(extract_first_tag),
-        'is_valid': 1
-    })
-    
     try:
-        insert_df_to_db(dim_df, 'dim_articles', conn)
-        
-        # Mark successfully loaded records as processed
-        loaded_ids = df_clean['id'].tolist()
-        _= mark_records_as_processed(conn, 'stg_medium_articles', 'id', loaded_ids)
-        
+        _= _load_staging_to_dim(df_clean, conn, 'stg_medium_articles')
         return True
         
     except Exception as e:
@@ -1,8 +1,65 @@
+import re
+import numpy as np
+from itertools import repeat
 import pandera as pa
 import pandas as pd
 import sqlite3
 from typing import Tuple, Optional
-from utils.sqlite_db import SCHEMAS, create_table, insert_df_to_db
+from utils.sqlite_db import SCHEMAS, ChunkedInsert, bulk_load, create_table
+
+
+# Regex patterns compiled once at import and reused by every validation run
+_AUTHOR_ID_RE = re.compile(r"[a-zA-Z0-9_-]+")
+_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_URL_RE = re.compile(r"https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+
+def _regex_mask(values: np.ndarray, match) -> np.ndarray:
+    """
+    Scan a column's raw values with a bound regex method into a boolean mask.
+
+    Args:
+        values: Column values (object/str ndarray).
+        match: Bound `re.Pattern` method (fullmatch or search).
+
+    Returns:
+        Boolean ndarray, True where the value matches or is not a string (null).
+    """
+    return np.fromiter(
+        (not isinstance(v, str) or match(v) is not None for v in values),
+        dtype=bool,
+        count=len(values)
+    )
+
+
+def _regex_check(pattern: re.Pattern, error: str, full: bool = True) -> pa.Check:
+    """
+    Build a Pandera check backed by a precompiled regex.
+
+    Arrow-backed string columns are matched with pyarrow compute kernels;
+    object columns are scanned in one pass into a vectorized boolean mask,
+    skipping per-element Series.map dispatch.
+
+    Args:
+        pattern: Compiled regex pattern.
+        error: Error message reported on failure.
+        full: If True the whole value must match (fullmatch), otherwise the
+            pattern may appear anywhere in the value (search).
+
+    Returns:
+        Pandera Check; null values pass (nullability is checked separately).
+    """
+    match = pattern.fullmatch if full else pattern.search
+
+    def check(s: pd.Series) -> pd.Series:
+        # Arrow-backed strings: regex runs as a pyarrow compute kernel over the buffer
+        if getattr(s.dtype, 'storage', None) == 'pyarrow':
+            matcher = s.str.fullmatch if full else s.str.contains
+            return matcher(pattern.pattern, na=True)
+        return pd.Series(_regex_mask(s.to_numpy(), match), index=s.index)
+
+    return pa.Check(check, error=error)
 
 
 SCHEMA_GFG_ARTICLES = pa.DataFrameSchema({
@@ -10,15 +67,15 @@ SCHEMA_GFG_ARTICLES = pa.DataFrameSchema({
         str, 
         required=True,
         checks=[
-            pa.Check(lambda s: s.str.len() > 0, error="article_id cannot be empty")
+            pa.Check.str_length(min_value=1, error="article_id cannot be empty")
         ]
     ),
     "title": pa.Column(
         str, 
         required=True,
         checks=[
-            pa.Check(lambda s: s.str.len() >= 6, error="title too short"),
-            pa.Check(lambda s: s.str.len() <= 200, error="title too long")
+            # Single bounded length check (one pass for both limits)
+            pa.Check.str_length(6, 200, error="title length must be 6-200 chars")
         ]
     ),
     "author_id": pa.Column(
@@ -26,17 +83,14 @@ SCHEMA_GFG_ARTICLES = pa.DataFrameSchema({
         nullable=True,
         checks=[
             # Allow alphanumeric, underscores, hyphens, mixed case
-            pa.Check.str_matches(r"^[a-zA-Z0-9_-]+$", error="invalid author_id format")
+            _regex_check(_AUTHOR_ID_RE, error="invalid author_id format")
         ]
     ),
     "last_updated": pa.Column(
         str, 
         nullable=True,
         checks=[
-            pa.Check.str_matches(
-                r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$",
-                error="invalid datetime format"
-            )
+            _regex_check(_DATETIME_RE, error="invalid datetime format")
         ]
     ),
     "link": pa.Column(
@@ -44,10 +98,7 @@ SCHEMA_GFG_ARTICLES = pa.DataFrameSchema({
         nullable=True,
         checks=[
             # Validate URL exists in string (allows markdown wrapping)
-            pa.Check.str_contains(
-                r"https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-                error="missing valid URL"
-            )
+            _regex_check(_URL_RE, error="missing valid URL", full=False)
         ]
     ),
     "category": pa.Column(
@@ -62,15 +113,15 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
         str, 
         required=True,
         checks=[
-            pa.Check(lambda s: s.str.len() > 0, error="id_rss cannot be empty")
+            pa.Check.str_length(min_value=1, error="id_rss cannot be empty")
         ]
     ),
     "title": pa.Column(
         str, 
         required=True,
         checks=[
-            pa.Check(lambda s: s.str.len() >= 3, error="title too short"),
-            pa.Check(lambda s: s.str.len() <= 500, error="title too long")
+            # Single bounded length check (one pass for both limits)
+            pa.Check.str_length(3, 500, error="title length must be 3-500 chars")
         ]
     ),
     "title_detail": pa.Column(
@@ -78,7 +129,7 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
         nullable=True,
         checks=[
             pa.Check(
-                lambda s: s.isna() | s.str.startswith('{') | s.str.startswith('['),
+                lambda s: s.str.startswith(('{', '['), na=True),
                 error="title_detail must be valid JSON format"
             )
         ]
@@ -87,7 +138,7 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
         str, 
         nullable=True,
         checks=[
-            pa.Check(lambda s: s.str.len() <= 5000, error="summary too long")
+            pa.Check.str_length(max_value=5000, error="summary too long")
         ]
     ),
     "summary_detail": pa.Column(
@@ -95,7 +146,7 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
         nullable=True,
         checks=[
             pa.Check(
-                lambda s: s.isna() | s.str.startswith('{') | s.str.startswith('['),
+                lambda s: s.str.startswith(('{', '['), na=True),
                 error="summary_detail must be valid JSON format"
             )
         ]
@@ -104,37 +155,28 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
         str, 
         nullable=True,
         checks=[
-            pa.Check.str_contains(
-                r"https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-                error="missing valid URL"
-            )
+            _regex_check(_URL_RE, error="missing valid URL", full=False)
         ]
     ),
     "published": pa.Column(
         str, 
         nullable=True,
         checks=[
-            pa.Check.str_matches(
-                r"^\d{4}-\d{2}-\d{2}$",
-                error="published must be in format YYYY-MM-DD"
-            )
+            _regex_check(_DATE_RE, error="published must be in format YYYY-MM-DD")
         ]
     ),
     "published_parsed": pa.Column(
         str, 
         nullable=True,
         checks=[
-            pa.Check(lambda s: s.str.len() <= 200, error="published_parsed too long")
+            pa.Check.str_length(max_value=200, error="published_parsed too long")
         ]
     ),
     "updated": pa.Column(
         str, 
         nullable=True,
         checks=[
-            pa.Check.str_matches(
-                r"^\d{4}-\d{2}-\d{2}$",
-                error="updated must be in format YYYY-MM-DD"
-            )
+            _regex_check(_DATE_RE, error="updated must be in format YYYY-MM-DD")
         ]
     ),
     "tags": pa.Column(
@@ -142,7 +184,7 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
         nullable=True,
         checks=[
             pa.Check(
-                lambda s: s.isna() | s.str.startswith('['),
+                lambda s: s.str.startswith('[', na=True),
                 error="tags must be valid JSON array"
             )
         ]
@@ -152,7 +194,7 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
         nullable=True,
         checks=[
             pa.Check(
-                lambda s: s.isna() | s.str.startswith('['),
+                lambda s: s.str.startswith('[', na=True),
                 error="authors must be valid JSON array"
             )
         ]
@@ -160,6 +202,32 @@ SCHEMA_MEDIUM_ARTICLES = pa.DataFrameSchema({
 }, strict=False)
 
 
+# Staging table -> validation schema (built once at import, shared by all runs)
+DQ_SCHEMAS = {
+    'stg_gfg_articles': SCHEMA_GFG_ARTICLES,
+    'stg_medium_articles': SCHEMA_MEDIUM_ARTICLES,
+}
+
+
+def get_schema(table_name: str) -> pa.DataFrameSchema:
+    """
+    Return the validation schema registered for a staging table.
+
+    Args:
+        table_name: Name of staging table.
+
+    Returns:
+        Module-level Pandera schema for the table.
+
+    Raises:
+        ValueError: If no schema is registered for the table.
+    """
+    schema = DQ_SCHEMAS.get(table_name)
+    if schema is None:
+        raise ValueError(f"No schema configuration for table: {table_name}")
+    return schema
+
+
 def dq_pandera(df: pd.DataFrame, table_name: str) -> Optional[pa.errors.SchemaErrors]:
     """
     Perform comprehensive data quality validation using Pandera schema.
@@ -175,14 +243,14 @@ def dq_pandera(df: pd.DataFrame, table_name: str) -> Optional[pa.errors.SchemaEr
         SchemaErrors object containing all validation failures if errors exist,
         None if validation passes.
     """    
+    # Nothing to validate: skip building Pandera's validation plan
+    if df.empty:
+        print(f"SKIP: Schema validation {table_name} (no rows)")
+        return None
+
     try:
         # Use lazy validation to collect all errors in a single pass
-        if table_name == 'stg_medium_articles':
-            SCHEMA_MEDIUM_ARTICLES.validate(df, lazy=True)
-        elif table_name == 'stg_gfg_articles':
-            SCHEMA_GFG_ARTICLES.validate(df, lazy=True)
-        else:
-            raise ValueError (f"No schema configuration for table: {table_name}")
+        get_schema(table_name).validate(df, lazy=True)
         print(f"PASS: Schema validation {table_name}")
         return None
         
@@ -191,6 +259,51 @@ def dq_pandera(df: pd.DataFrame, table_name: str) -> Optional[pa.errors.SchemaEr
         return e
 
 
+def dq_pandera_fast(df: pd.DataFrame, table_name: str, 
+                    sample: int = 10_000) -> Optional[pa.errors.SchemaErrors]:
+    """
+    Sample-first Pandera validation for quick DQ previews on large staging tables.
+    
+    Validates a random sample (fixed seed) first and returns its errors as soon as
+    the sample fails; the full DataFrame is validated only when the sample passes.
+    Sampled rows keep their original index, so errors map back to df. When the
+    sample fails, errors cover only sampled rows: use dq_pandera before quarantine
+    and dimensional loading.
+    
+    Args:
+        df: Input DataFrame from staging table to validate.
+        table_name: Name of staging table for schema lookup and logging.
+        sample: Row count above which the sample is validated first.
+        
+    Returns:
+        SchemaErrors object if the sample (or full) validation fails, None if it passes.
+    """
+    if len(df) > sample:
+        errors = dq_pandera(df.sample(sample, random_state=42), table_name)
+        if errors is not None:
+            print(f"Sample of {sample} rows failed, skipping full validation {table_name}")
+            return errors
+    return dq_pandera(df, table_name)
+
+
+def summarize_errors(errors: pa.errors.SchemaErrors, top: int = 3) -> str:
+    """
+    Build a bounded one-line summary of Pandera validation failures.
+    
+    Used for logs instead of stringifying the whole failure_cases frame,
+    which can grow to megabytes on large failing batches.
+    
+    Args:
+        errors: Pandera SchemaErrors object.
+        top: Number of most frequently failing columns to include.
+        
+    Returns:
+        Summary string, e.g. "151 failures; top_cols={'author_id': 91, 'title': 60}".
+    """
+    top_cols = errors.failure_cases['column'].value_counts().head(top).to_dict()
+    return f"{len(errors.failure_cases)} failures; top_cols={top_cols}"
+
+
 def quarantine_failed_records(df_failed: pd.DataFrame, 
                              conn: sqlite3.Connection, 
                              table_name: str, 
@@ -200,8 +313,8 @@ def quarantine_failed_records(df_failed: pd.DataFrame,
     Insert failed validation records into quarantine table using bulk operations.
     
     Creates quarantine records with metadata about validation failures including
-    source table, primary key values, and error descriptions. Uses chunked inserts
-    for performance with large datasets.
+    source table, primary key values, and error descriptions. Records are streamed
+    through ChunkedInsert, so memory stays flat regardless of the failure count.
     
     Args:
         df_failed: DataFrame containing complete failed records from original data.
@@ -221,25 +334,29 @@ def quarantine_failed_records(df_failed: pd.DataFrame,
         errors.failure_cases
         .groupby('index')['column']
         .apply(lambda x: ', '.join(x.unique()))
-        .to_dict()
     )
     
-    # Prepare quarantine DataFrame with standardized structure
-    quarantine_df = pd.DataFrame({
-        'source_table': table_name,
-        'pk_column_name': pk_col,
-        'pk_value': df_failed[pk_col].astype(str),
-        'total_columns': len(df_failed.columns),
-        'validation_error': df_failed.index.map(
-            lambda idx: f"Failed columns: {error_summary.get(idx, 'unknown')}"
-        )
-    })
+    # One hashed reindex + vectorized concat instead of a per-row lookup
+    validation_errors = (
+        'Failed columns: '
+        + df_failed.index.to_series().map(error_summary).fillna('unknown').astype(str)
+    )
+    
+    quarantine_cols = ['source_table', 'pk_column_name', 'pk_value', 'total_columns', 'validation_error']
+    rows = zip(
+        repeat(table_name),
+        repeat(pk_col),
+        df_failed[pk_col].astype(str),
+        repeat(len(df_failed.columns)),
+        validation_errors
+    )
     
     try:
-        # Use bulk insert with chunking for performance
-        insert_df_to_db(quarantine_df, 'dq_quarantine', conn, chunksize=1000)
-        print(f"  Quarantined {len(quarantine_df)} records")
-        return len(quarantine_df)
+        # Stream one quarantine row per failed record, flushed in chunks
+        with bulk_load(conn), ChunkedInsert(conn, 'dq_quarantine', quarantine_cols) as writer:
+            writer.insert_many(rows)
+        print(f"  Quarantined {writer.rows_inserted} records")
+        return writer.rows_inserted
     except Exception as e:
         print(f"  Quarantine bulk insert failed: {e}")
         return 0
@@ -255,7 +372,8 @@ def extract_failed_records_general(errors: Optional[pa.errors.SchemaErrors],
     
     Extracts unique failed record indices from validation errors, retrieves complete
     records from original DataFrame, sends them to quarantine, and returns clean subset.
-    Ensures quarantine table exists before attempting inserts.
+    Ensures quarantine table exists before attempting inserts. Works only from the
+    SchemaErrors returned by dq_pandera: the DataFrame is never validated twice.
     
     Args:
         errors: Pandera SchemaErrors object from validation, None if no errors.
@@ -269,6 +387,11 @@ def extract_failed_records_general(errors: Optional[pa.errors.SchemaErrors],
         failed records removed and index reset. Quarantined count is 0 if no errors
         or operation fails.
     """
+    # Nothing to split or quarantine
+    if df_original.empty:
+        print("No records to check")
+        return df_original, 0
+
     # Retrieve quarantine table schema
     schema = SCHEMAS.get('dq_quarantine')
     if not schema:
@@ -294,16 +417,18 @@ def extract_failed_records_general(errors: Optional[pa.errors.SchemaErrors],
         error_types = errors.failure_cases['check'].unique()
         print("  CRITICAL: DataFrame-level validation errors detected")
         print(f"  Error types: {error_types.tolist()}")
-        print(f"  Failed checks: {errors.failure_cases[['column', 'check', 'failure_case']].to_dict('records')}")
+        print(f"  Failed checks: {summarize_errors(errors)}")
         raise ValueError(
             f"Critical schema validation failure for {table_name}. "
             f"DataFrame-level errors: {error_types.tolist()}. "
         )
     
-    print(f"Found {len(failed_indices)} unique failed records (from {len(errors.failure_cases)} total validation errors)")
+    print(f"Found {len(failed_indices)} unique failed records ({summarize_errors(errors)})")
     
-    # Retrieve complete failed records using indices
-    df_failed_complete = df_original.loc[failed_indices].copy()
+    # One vectorized membership pass over the index splits failed and clean rows
+    # (works for any index, no per-label lookup, no defensive copy)
+    failed_mask = df_original.index.isin(failed_indices)
+    df_failed_complete = df_original[failed_mask]
     
     # Send failed records to quarantine
     quarantined_count = quarantine_failed_records(
@@ -311,7 +436,7 @@ def extract_failed_records_general(errors: Optional[pa.errors.SchemaErrors],
     )
     
     # Remove failed records from original DataFrame
-    clean_df = df_original.drop(failed_indices).reset_index(drop=True)
+    clean_df = df_original[~failed_mask].reset_index(drop=True)
     print(f"Clean records returned: {len(clean_df)}")
     
     return clean_df, quarantined_count
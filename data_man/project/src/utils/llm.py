@@ -1,11 +1,40 @@
 import requests
 import yaml
 import asyncio
+import copy
+import threading
+from functools import lru_cache
 from pathlib import Path
 from utils import scraping
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+# libyaml-backed loader when available (much faster than the pure-Python parser)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# One HTTP session per thread (requests.Session is not guaranteed thread-safe):
+# each worker keeps its own TCP+TLS connection to the API warm across calls
+_THREAD_LOCAL = threading.local()
+
+
+def _get_session() -> requests.Session:
+    """Return the calling thread's HTTP session, creating it on first use."""
+    session = getattr(_THREAD_LOCAL, "session", None)
+    if session is None:
+        session = _THREAD_LOCAL.session = requests.Session()
+    return session
+
+
+@lru_cache(maxsize=16)
+def _read_prompt_config(prompt_name: str) -> dict:
+    """Parse a prompt YAML file once; callers must copy before mutating."""
+    prompt_file = PROMPTS_DIR / f"{prompt_name}.yaml"
+
+    with open(prompt_file, encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 
 def load_prompt(prompt_name: str, content: str = ""):
     """Load YAML prompt and build universal messages.
@@ -17,10 +46,8 @@ def load_prompt(prompt_name: str, content: str = ""):
     Returns:
         dict: OpenAI-ready config
     """
-    prompt_file = PROMPTS_DIR / f"{prompt_name}.yaml"
-
-    with open(prompt_file, encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+    # Parsed once per prompt, deep-copied so the cached dict is never mutated
+    config = copy.deepcopy(_read_prompt_config(prompt_name))
 
     len_content = len(content)
 
@@ -57,8 +84,8 @@ def call_openai(api_key: str, content: str, prompt_name: str = "article_analyzer
 
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
 
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
+    response = _get_session().post(
+        OPENAI_CHAT_URL,
         headers=headers,
         json=prompt_config["data"],
         timeout=45,
@@ -67,14 +94,17 @@ def call_openai(api_key: str, content: str, prompt_name: str = "article_analyzer
     return response.json()["choices"][0]["message"]["content"]
 
 
-def analyze_article(
+async def analyze_article_async(
     oai_key: str,
     raw_cookies: list[dict],
     url: str,
     min_chars: int = 1000,
     prompt_name: str = "250109_dq_do_analyzer",
 ) -> str:
-    """Analyzes Medium article with LLM (assumes env/cookies pre-loaded).
+    """Analyzes Medium article with LLM without blocking the event loop.
+
+    The scrape is awaited directly and the blocking OpenAI request runs in a
+    worker thread, so several articles can be analyzed concurrently.
 
     Args:
         oai_key (str): OpenAI API key.
@@ -92,7 +122,7 @@ def analyze_article(
     print(f"Analyzing {url}")
 
     # Async scrape
-    content = asyncio.run(scraping.fetch_medium_article(raw_cookies, url))
+    content = await scraping.fetch_medium_article(raw_cookies, url)
     print(f"Fetched {len(content):,} chars")
 
     # Min length
@@ -100,7 +130,83 @@ def analyze_article(
         raise ValueError(f"Content too short: {len(content)} < {min_chars}")
 
     print("GPT analyzing...")
-    result = call_openai(oai_key, content, prompt_name=prompt_name)
+    return await asyncio.to_thread(call_openai, oai_key, content, prompt_name=prompt_name)
+
+
+def analyze_article(
+    oai_key: str,
+    raw_cookies: list[dict],
+    url: str,
+    min_chars: int = 1000,
+    prompt_name: str = "250109_dq_do_analyzer",
+) -> str:
+    """Analyzes Medium article with LLM (assumes env/cookies pre-loaded).
+
+    Args:
+        oai_key (str): OpenAI API key.
+        raw_cookies (list[dict]): Loaded Medium cookies.
+        url (str): Medium article URL.
+        min_chars (int, optional): Skip if content < this.
+        prompt_name (str, optional): LLM prompt name.
+
+    Returns:
+        str: GPT analysis result.
+
+    Raises:
+        ValueError: Content too short.
+    """
+    result = asyncio.run(
+        analyze_article_async(oai_key, raw_cookies, url, min_chars=min_chars, prompt_name=prompt_name)
+    )
 
     print("FINAL RESULT:")
     return result
+
+
+def analyze_articles(
+    oai_key: str,
+    raw_cookies: list[dict],
+    urls: list[str],
+    min_chars: int = 1000,
+    prompt_name: str = "250109_dq_do_analyzer",
+    max_concurrency: int = 8,
+) -> list:
+    """Analyzes several Medium articles concurrently.
+
+    All articles are scraped with one shared browser context, then analyzed
+    concurrently: latency overlaps across articles instead of adding up, and a
+    semaphore caps in-flight requests to respect OpenAI rate limits.
+
+    Args:
+        oai_key (str): OpenAI API key.
+        raw_cookies (list[dict]): Loaded Medium cookies.
+        urls (list[str]): Medium article URLs.
+        min_chars (int, optional): Skip if content < this.
+        prompt_name (str, optional): LLM prompt name.
+        max_concurrency (int, optional): Articles analyzed at the same time. Defaults to 8.
+
+    Returns:
+        list: One entry per URL, in order: the GPT analysis result or the raised exception.
+    """
+    async def run_all():
+        # One browser + cookie context scrapes every article
+        contents = await scraping.fetch_medium_articles(
+            raw_cookies, urls, concurrency=max_concurrency, return_exceptions=True
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze_one(url: str, content) -> str:
+            if isinstance(content, BaseException):
+                raise content
+            print(f"Fetched {len(content):,} chars from {url}")
+            if len(content) < min_chars:
+                raise ValueError(f"Content too short: {len(content)} < {min_chars}")
+            async with semaphore:
+                return await asyncio.to_thread(call_openai, oai_key, content, prompt_name=prompt_name)
+
+        return await asyncio.gather(
+            *(analyze_one(url, content) for url, content in zip(urls, contents)),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(run_all())
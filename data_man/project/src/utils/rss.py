@@ -1,12 +1,18 @@
 import feedparser
-import json
+import orjson
 import pandas as pd
+import requests
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from typing import Optional
 
 from utils.sqlite_db import (
     SCHEMAS,
+    BackgroundWriter,
     create_table,
-    insert_df_to_db
+    insert_df_to_db_fast
 )
 
 
@@ -29,29 +35,80 @@ RSS_FEEDS = [
 ]
 
 
-def get_feed_df(rss_url: str) -> pd.DataFrame:
+# Per-feed HTTP timeout (seconds): one stalled feed must not hold the fetch pool
+RSS_TIMEOUT = 20
+
+# feedparser entry fields kept for staging (everything transform_medium reads)
+FEED_ENTRY_FIELDS = (
+    'title', 'title_detail', 'summary', 'summary_detail', 'link', 'id',
+    'published', 'published_parsed', 'updated', 'tags', 'authors',
+)
+
+# RFC-822 date layout used by RSS <pubDate> (e.g. 'Mon, 12 Jan 2026 10:00:00 GMT')
+RSS_DATE_FORMAT = '%a, %d %b %Y %H:%M:%S %Z'
+
+
+def get_feed_df(rss_url: str, timeout: int = RSS_TIMEOUT) -> pd.DataFrame:
     """Parses RSS/Atom feed and returns raw entries.
 
-    Logs bozo exceptions, returns empty list on parse failure.
+    Downloads the feed with a bounded timeout, then parses the bytes.
+    Logs HTTP errors and bozo exceptions, returns empty list on failure.
 
     Args:
         rss_url (str): RSS feed URL.
+        timeout (int, optional): HTTP timeout in seconds. Defaults to RSS_TIMEOUT.
 
     Returns:
-        pd.DataFrame: DataFrame of feedparser entry dicts, or empty on error.
+        pd.DataFrame: One row per entry with the FEED_ENTRY_FIELDS columns, or empty on error.
     """
-    feed = feedparser.parse(rss_url)
+    try:
+        response = requests.get(
+            rss_url, headers={"User-Agent": feedparser.USER_AGENT}, timeout=timeout
+        )
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error fetching {rss_url}: {e}")
+        return pd.DataFrame()
+
+    feed = feedparser.parse(response.content)
     if feed.bozo:
         print(f"Error parsing {rss_url}: {feed.bozo_exception}")
         return pd.DataFrame()
-    return pd.DataFrame(feed.entries)
+    # Columnar build: one list per field instead of hashing every entry dict into rows
+    entries = feed.entries
+    return pd.DataFrame({field: [e.get(field) for e in entries] for field in FEED_ENTRY_FIELDS})
+
+
+def format_feed_dates(dates: pd.Series) -> pd.Series:
+    """
+    Normalize feed date strings to YYYY-MM-DD.
+
+    RSS feeds (Medium included) use RFC-822 dates, parsed with one fixed-format
+    vectorized pass. Only values that don't match fall back to per-element
+    format guessing (normalized to UTC).
+
+    Args:
+        dates: Raw date strings (e.g. 'Mon, 12 Jan 2026 10:00:00 GMT').
+
+    Returns:
+        Dates as 'YYYY-MM-DD' strings, '' where missing or unparseable.
+    """
+    formatted = pd.to_datetime(dates, format=RSS_DATE_FORMAT, errors='coerce').dt.strftime('%Y-%m-%d')
+
+    retry = formatted.isna() & dates.notna()
+    if retry.any():
+        formatted[retry] = pd.to_datetime(
+            dates[retry], format='mixed', utc=True, errors='coerce'
+        ).dt.strftime('%Y-%m-%d')
+
+    return formatted.fillna('')
 
 
 def transform_medium(df: pd.DataFrame) -> pd.DataFrame:
     """
     Transform Medium RSS DataFrame for staging table.
 
-    Flattens nested dicts (title_detail, tags, authors) to JSON strings using vectorized apply.
+    Flattens nested dicts (title_detail, tags, authors) to JSON strings with orjson.
     Normalizes date fields to YYYY-MM-DD format. Deduplicates by link/id_rss. 
     Handles missing values safely with fillna.
 
@@ -71,27 +128,23 @@ def transform_medium(df: pd.DataFrame) -> pd.DataFrame:
                   'tags', 'authors']].copy()
     flat_df.rename(columns={'id': 'id_rss'}, inplace=True)
 
-    # Vectorized JSON dump for nested fields (dict/list -> string)
+    # JSON dump for nested fields (dict/list -> string), orjson C serializer
     json_cols = ['title_detail', 'summary_detail', 'tags', 'authors']
     for col in json_cols:
-        flat_df[col] = flat_df[col].apply(
-            lambda x: json.dumps(x) if isinstance(x, (dict, list)) else json.dumps({})
-        )
+        flat_df[col] = [
+            orjson.dumps(x).decode() if isinstance(x, (dict, list)) else '{}'
+            for x in flat_df[col].tolist()
+        ]
 
     # Normalize date columns to YYYY-MM-DD format
     date_cols = ['published', 'updated']
     for col in date_cols:
         if col in flat_df.columns:
-            # Parse various date formats and convert to YYYY-MM-DD
-            # errors='coerce' converts invalid dates to NaT (then to empty string)
-            flat_df[col] = pd.to_datetime(flat_df[col], errors='coerce').dt.strftime('%Y-%m-%d')
-            # Replace NaT (becomes 'NaT' string after strftime) with empty string
-            flat_df[col] = flat_df[col].replace('NaT', '')
+            flat_df[col] = format_feed_dates(flat_df[col])
 
-    # Safe string cleaning for scalar fields
+    # Safe string cleaning for scalar fields (one block assign, Arrow-backed strings)
     scalar_cols = ['title', 'summary', 'link', 'id_rss', 'published_parsed']
-    for col in scalar_cols:
-        flat_df[col] = flat_df[col].fillna('').astype(str)
+    flat_df[scalar_cols] = flat_df[scalar_cols].fillna('').astype('string[pyarrow]')
 
     # Deduplicate prioritizing latest by link/id_rss
     initial_count = len(flat_df)
@@ -104,10 +157,39 @@ def transform_medium(df: pd.DataFrame) -> pd.DataFrame:
     return flat_df
 
 
+def fetch_rss(rss: dict, transform_func=None) -> pd.DataFrame:
+    """
+    Fetch a single RSS feed and apply the optional transform.
+
+    Touches no database connection, so it can safely run in worker threads
+    (sqlite3 connections must stay on the thread that writes).
+
+    Args:
+        rss (dict): Feed config with 'url' key (see RSS_FEEDS).
+        transform_func (callable, optional): Transformation function(df) -> df.
+
+    Returns:
+        pd.DataFrame: Parsed (and transformed) feed entries, empty on error.
+    """
+    df = get_feed_df(rss["url"])
+    if transform_func:
+        df = transform_func(df)
+    return df
+
+
 def ingest_rss_to_db(rss: dict, conn: sqlite3.Connection, table_name: str, 
                      transform_func=None) -> bool:
     """
+    Ingest a single RSS feed into a staging table.
 
+    Args:
+        rss (dict): Feed config with 'url' key (see RSS_FEEDS).
+        conn (sqlite3.Connection): Active database connection.
+        table_name (str): Target table name (must exist in SCHEMAS).
+        transform_func (callable, optional): Transformation function(df) -> df.
+
+    Returns:
+        bool: True if ingestion succeeded, False otherwise.
     """
     try:
         # Retrieve schema dynamically from SCHEMAS
@@ -120,12 +202,10 @@ def ingest_rss_to_db(rss: dict, conn: sqlite3.Connection, table_name: str,
         if not create_table(conn, table_name, schema):
             return False
         
-        df = get_feed_df(rss["url"])
-        if transform_func:
-            df = transform_func(df)
+        df = fetch_rss(rss, transform_func)
         
         # Bulk insert (AUTOINCREMENT handles id)
-        insert_df_to_db(df, 'stg_medium_articles', conn)
+        insert_df_to_db_fast(df, table_name, conn)
 
         print(f"Ingested {len(df)} rows into '{table_name}'")
         return True
@@ -133,3 +213,62 @@ def ingest_rss_to_db(rss: dict, conn: sqlite3.Connection, table_name: str,
     except Exception as e:
         print(f"Error ingesting to '{table_name}': {e}")
         return False
+
+
+def ingest_rss_feeds_to_db(feeds: list, conn: sqlite3.Connection, table_name: str,
+                           transform_func=None, max_workers: int = 8,
+                           writer: Optional[BackgroundWriter] = None) -> bool:
+    """
+    Ingest several RSS feeds into a staging table, fetching them concurrently.
+
+    Feeds are downloaded and transformed in a thread pool (network-bound, so
+    wall-clock time is the slowest feed instead of the sum of all feeds). The
+    results are then appended one frame at a time on the calling thread.
+
+    Args:
+        feeds (list): Feed configs with 'url' key (see RSS_FEEDS).
+        conn (sqlite3.Connection): Active database connection.
+        table_name (str): Target table name (must exist in SCHEMAS).
+        transform_func (callable, optional): Transformation function(df) -> df.
+        max_workers (int, optional): Maximum number of concurrent fetches. Defaults to 8.
+        writer (BackgroundWriter, optional): Hand frames to this background writer
+            instead of inserting on `conn`; rows are committed by the time it is closed.
+
+    Returns:
+        bool: True if ingestion succeeded, False otherwise.
+    """
+    try:
+        # Retrieve schema dynamically from SCHEMAS
+        schema = SCHEMAS.get(table_name)
+        if not schema:
+            print(f"Schema not found for table '{table_name}'")
+            return False
+
+        # Ensure table exists
+        if not create_table(conn, table_name, schema):
+            return False
+
+        # Fetch feeds in parallel (no db access in workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            dfs = list(ex.map(partial(fetch_rss, transform_func=transform_func), feeds))
+
+        dfs = [df for df in dfs if not df.empty]
+        if not dfs:
+            print(f"No RSS entries to ingest into '{table_name}'")
+            return True
+
+        # Append each feed's frame in turn: no pd.concat copy of all entries
+        # (AUTOINCREMENT handles id)
+        for df in dfs:
+            if writer is not None:
+                writer.put(df, table_name)
+            else:
+                insert_df_to_db_fast(df, table_name, conn)
+
+        total_rows = sum(len(df) for df in dfs)
+        print(f"Ingested {total_rows} rows from {len(feeds)} feeds into '{table_name}'")
+        return True
+
+    except Exception as e:
+        print(f"Error ingesting to '{table_name}': {e}")
+        return False
@@ -1,10 +1,13 @@
-import re
+import asyncio
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError, Error
 
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
+# sameSite values Playwright accepts
+_VALID_SAMESITE = frozenset({"Strict", "Lax", "None"})
+
 
 def format_playwright_cookies(cookies: list):
     """Convert EditThisCookie JSON format to Playwright cookie format.
@@ -15,21 +18,16 @@ def format_playwright_cookies(cookies: list):
     Returns:
         list: Playwright-compatible cookies with fixed sameSite values
     """
-    pw_cookies = []
-
-    for cookie in cookies:
-        pw_cookie = {
+    return [
+        {
             "name": cookie["name"],
             "value": cookie["value"],
             "domain": cookie["domain"],
             "path": cookie.get("path", "/"),
+            **({"sameSite": same_site} if (same_site := cookie.get("sameSite", "Lax")) in _VALID_SAMESITE else {}),
         }
-        same_site = cookie.get("sameSite", "Lax")
-        if same_site in ["Strict", "Lax", "None"]:
-            pw_cookie["sameSite"] = same_site
-        pw_cookies.append(pw_cookie)
-
-    return pw_cookies
+        for cookie in cookies
+    ]
 
 
 def safe_cleanup(raw_content: str):
@@ -43,10 +41,9 @@ def safe_cleanup(raw_content: str):
     """
     original_len = len(raw_content)
 
-    # Basic cleanup
-    content = re.sub(r"\n{3,}", "\n\n", raw_content)
-    content = re.sub(r"\s+", " ", content)
-    content = content.strip()
+    # Basic cleanup: every whitespace run (newlines included) becomes one space.
+    # str.split() finds the runs and trims the ends in a single C-level pass.
+    content = " ".join(raw_content.split())
 
     final_len = len(content)
     print(f"original len: {original_len} chars, cleaned len: {final_len} chars")
@@ -59,56 +56,102 @@ def safe_cleanup(raw_content: str):
         return content[:15000]
 
 
-async def fetch_medium_article(raw_cookies: list, url: str):
-    """Fetch full Medium article bypassing paywall with cookies.
-       Async function so the await functions put in parallel the requests if needed.
+# Article body candidates, matched as one grouped selector
+ARTICLE_SELECTORS = [
+    "article",
+    "main",
+    ".postArticle-content",
+    ".pw-article-body",
+    "[data-testid='post-article-content']",
+]  # TO BE EXPANDED
+ARTICLE_LOCATOR = ", ".join(ARTICLE_SELECTORS)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+async def _scrape_article_page(context, url: str):
+    """Load one article in a new page of an existing browser context.
 
     Args:
+        context: Playwright BrowserContext with Medium cookies already added.
         url (str): Medium article URL
 
     Returns:
-        str: Cleaned article content (min 1000 chars)
+        str: Cleaned article content
     """
-    pw_cookies = format_playwright_cookies(raw_cookies)
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        )
-        await context.add_cookies(pw_cookies)
-        page = await context.new_page()
-
-        print("Loading the article page...")
+    page = await context.new_page()
+    try:
+        print(f"Loading the article page {url}...")
         await page.goto(url, wait_until="domcontentloaded", timeout=60000)
         await page.wait_for_timeout(5000)
 
+        # One grouped CSS locator: the browser returns the first node matching any
+        # selector, instead of waiting on each selector in turn
         content = ""
-        selectors = [
-            "article",
-            "main",
-            ".postArticle-content",
-            ".pw-article-body",
-            "[data-testid='post-article-content']",
-        ]  # TO BE EXPANDED
-
-        for selector in selectors:
-            try:
-                element = await page.wait_for_selector(selector, timeout=4000)
-                raw_content = await element.text_content()
-                if raw_content and len(raw_content.strip()) > 1500:
-                    # Found sufficient content
-                    content = raw_content
-                    break
-            except (TimeoutError, Error):
-                print(f"Selector failed: {selector}")
-                continue
+        locator = page.locator(ARTICLE_LOCATOR).first
+        try:
+            await locator.wait_for(timeout=4000)
+            raw_content = await locator.text_content()
+            if raw_content and len(raw_content.strip()) > 1500:
+                # Found sufficient content
+                content = raw_content
+        except (TimeoutError, Error):
+            print(f"Article selectors failed: {ARTICLE_LOCATOR}")
 
         # Fallback to raw article content
         raw_content = content or await page.text_content("body")
 
         # Cleanup article content
-        cleaned_content = safe_cleanup(raw_content)
+        return safe_cleanup(raw_content)
+    finally:
+        await page.close()
 
-        await browser.close()
-        return cleaned_content
+
+async def fetch_medium_articles(raw_cookies: list, urls: list, concurrency: int = 8,
+                                return_exceptions: bool = False):
+    """Fetch several Medium articles with one browser and one cookie context.
+       Pages load concurrently (bounded by a semaphore), so the browser start-up
+       and cookie setup are paid once per batch instead of once per article.
+
+    Args:
+        raw_cookies (list): Raw cookies from EditThisCookie export
+        urls (list): Medium article URLs
+        concurrency (int, optional): Pages open at the same time. Defaults to 8.
+        return_exceptions (bool, optional): Return a failed article's exception in
+            its slot instead of raising. Defaults to False.
+
+    Returns:
+        list: Cleaned article content per URL, in order
+    """
+    pw_cookies = format_playwright_cookies(raw_cookies)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context(user_agent=USER_AGENT)
+            await context.add_cookies(pw_cookies)
+
+            async def fetch_one(url: str):
+                async with semaphore:
+                    return await _scrape_article_page(context, url)
+
+            return await asyncio.gather(
+                *(fetch_one(url) for url in urls), return_exceptions=return_exceptions
+            )
+        finally:
+            await browser.close()
+
+
+async def fetch_medium_article(raw_cookies: list, url: str):
+    """Fetch full Medium article bypassing paywall with cookies.
+       Async function so the await functions put in parallel the requests if needed.
+
+    Args:
+        url (str): Medium article URL
+
+    Returns:
+        str: Cleaned article content (min 1000 chars)
+    """
+    (content,) = await fetch_medium_articles(raw_cookies, [url])
+    return content
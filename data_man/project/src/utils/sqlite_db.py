@@ -1,9 +1,35 @@
 import sqlite3
 import os
+import re
+import queue
+import threading
+import numpy as np
 import pandas as pd
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import Iterator, Optional
 
 
+# Bound-variable budget per statement (SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds)
+SQLITE_MAX_VARIABLES = 900
+
+# Penultimate path segment of an article link (same as link.split('/')[-2])
+_ARTICLE_ID_RE = re.compile(r'(?:^|/)([^/]*)/[^/]*$')
+
+# Bind pandas timestamps the same way to_sql does ('YYYY-MM-DD HH:MM:SS')
+sqlite3.register_adapter(pd.Timestamp, lambda ts: ts.isoformat(' '))
+
+# Applied to every new connection by create_database
+SQLITE_PRAGMAS = [
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'temp_store=MEMORY',
+    'cache_size=-65536',
+    'mmap_size=268435456',
+]
+
 SCHEMAS = {
     'stg_gfg_articles': '''
         id INTEGER,
@@ -61,6 +87,21 @@ SCHEMAS = {
 }
 
 
+# Secondary indexes per table: index name -> (indexed column(s), partial-index WHERE or None)
+INDEXES = {
+    'stg_gfg_articles': {
+        # Incremental runs read only unprocessed rows: O(unprocessed) instead of a full scan
+        'idx_stg_gfg_articles_unprocessed': ('id', 'processed = 0'),
+    },
+    'stg_medium_articles': {
+        'idx_stg_medium_articles_unprocessed': ('id', 'processed = 0'),
+    },
+    'dim_articles': {
+        'idx_dim_articles_platform': ('source_platform', None),
+    },
+}
+
+
 def create_database(db_path: str = 'data/demo.db') -> Optional[sqlite3.Connection]:
     """
     Create database directory and return connection safely.
@@ -79,6 +120,10 @@ def create_database(db_path: str = 'data/demo.db') -> Optional[sqlite3.Connectio
         
         # Create db Connection
         conn = sqlite3.connect(db_path)
+
+        # Write-throughput tuning: WAL journal, fewer fsyncs, in-memory temp, 64MB cache, 256MB mmap reads
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
         print(f"DB connencted: {os.path.abspath(db_path)}")
         return conn
         
@@ -87,6 +132,40 @@ def create_database(db_path: str = 'data/demo.db') -> Optional[sqlite3.Connectio
         return None
 
 
+@contextmanager
+def bulk_load(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run a block of bulk writes as one transaction with fsync disabled.
+
+    Sets PRAGMA synchronous=OFF for the duration of the block and restores the
+    previous level afterwards. In WAL mode this can lose the last commits on an
+    OS crash but cannot corrupt the database, which suits re-runnable staging
+    loads. journal_mode is left untouched (it cannot change inside a transaction).
+    The transaction is opened up front, so the insert helpers (insert_df_to_db,
+    insert_df_to_db_fast, ChunkedInsert) join it instead of committing on their own:
+    everything is committed on a clean exit and rolled back if the block raises.
+
+    Args:
+        conn (sqlite3.Connection): Active database connection.
+
+    Yields:
+        sqlite3.Connection: The same connection.
+
+    Example:
+        with bulk_load(conn):
+            insert_df_to_db_fast(df, 'stg_gfg_articles', conn)
+    """
+    previous = conn.execute("PRAGMA synchronous").fetchone()[0]
+    conn.execute("PRAGMA synchronous=OFF")
+    try:
+        with conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+    finally:
+        conn.execute(f"PRAGMA synchronous={previous}")
+
+
 def delete_database(db_path: str = 'data/demo.db') -> bool:
     """
     Safely delete database file and empty parent directory.
@@ -102,15 +181,11 @@ def delete_database(db_path: str = 'data/demo.db') -> bool:
             print(f"Database '{db_path}' does not exist (already clean)")
             return True
         
-        # Close any open connections
-        try:
-            conn = sqlite3.connect(db_path, timeout=1)
-            conn.close()
-        except:
-            pass
-        
-        # Delete DB file
+        # Delete DB file (and WAL side files left by an unclean shutdown)
         os.remove(db_path)
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
         print(f"Database '{db_path}' deleted successfully")
         
         # Clean empty parent directory (optional)
@@ -128,7 +203,8 @@ def delete_database(db_path: str = 'data/demo.db') -> bool:
         return False
 
 
-def create_table(conn: sqlite3.Connection, table_name: str, schema: str) -> bool:
+def create_table(conn: sqlite3.Connection, table_name: str, schema: str,
+                 verbose: bool = False) -> bool:
     """
     Create table if not exists with custom schema.
 
@@ -136,25 +212,26 @@ def create_table(conn: sqlite3.Connection, table_name: str, schema: str) -> bool
         conn (sqlite3.Connection): Active database connection.
         table_name (str): Name of the table (e.g., 'articles', 'authors').
         schema (str): SQL CREATE TABLE statement without 'CREATE TABLE' prefix.
+        verbose (bool, optional): Print the new table's columns. Defaults to False.
 
     Returns:
         bool: True if table created or already exists, False if error.
     """
-    cursor = conn.cursor()
     full_sql = f"CREATE TABLE IF NOT EXISTS {table_name} ({schema})"
     
-    # Check if table already exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-    table_exists = cursor.fetchone() is not None
+    # Check if table already exists: nothing else to do
+    cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+    if cur.fetchone() is not None:
+        print(f"Table '{table_name}' already exists")
+        return True
     
     try:
-        cursor.execute(full_sql)
+        conn.execute(full_sql)
+        create_indexes(conn, table_name)
         conn.commit()
-        
-        if table_exists:
-            print(f"Table '{table_name}' already exists")
-        else:
-            print(f"Table '{table_name}' created successfully")
+        print(f"Table '{table_name}' created successfully")
+
+        if verbose:
             print("\n")
             df_cols = pd.read_sql_query(f"PRAGMA table_info({table_name})", conn)
             print(df_cols[['name', 'type', 'pk']].to_string(index=False))
@@ -168,6 +245,52 @@ def create_table(conn: sqlite3.Connection, table_name: str, schema: str) -> bool
         return False
 
 
+def create_indexes(conn: sqlite3.Connection, table_name: str) -> bool:
+    """
+    Create the secondary indexes registered in INDEXES for a table.
+
+    Args:
+        conn (sqlite3.Connection): Active database connection.
+        table_name (str): Name of the indexed table (e.g., 'dim_articles').
+
+    Returns:
+        bool: True if indexes exist afterwards (or none are registered), False if error.
+    """
+    try:
+        for index_name, (columns, where) in INDEXES.get(table_name, {}).items():
+            sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({columns})"
+            if where:
+                sql += f" WHERE {where}"
+            conn.execute(sql)
+        return True
+    except sqlite3.Error as e:
+        print(f"Error creating indexes on '{table_name}': {e}")
+        return False
+
+
+def drop_indexes(conn: sqlite3.Connection, table_name: str) -> bool:
+    """
+    Drop the secondary indexes registered in INDEXES for a table.
+
+    Used around bulk loads so the rows are inserted without per-row index
+    maintenance; recreate them afterwards with create_indexes().
+
+    Args:
+        conn (sqlite3.Connection): Active database connection.
+        table_name (str): Name of the indexed table (e.g., 'dim_articles').
+
+    Returns:
+        bool: True if indexes dropped (or did not exist), False if error.
+    """
+    try:
+        for index_name in INDEXES.get(table_name, {}):
+            conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+        return True
+    except sqlite3.Error as e:
+        print(f"Error dropping indexes on '{table_name}': {e}")
+        return False
+
+
 def drop_table(conn: sqlite3.Connection, table_name: str) -> bool:
     """
     Drop table if exists safely.
@@ -184,11 +307,9 @@ def drop_table(conn: sqlite3.Connection, table_name: str) -> bool:
             print("Table dropped successfully")
     """
     try:
-        cursor = conn.cursor()
-
-        cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+        cur = conn.execute(f"DROP TABLE IF EXISTS {table_name}")
         conn.commit()
-        if cursor.rowcount > 0:
+        if cur.rowcount > 0:
             print(f"Table '{table_name}' dropped")
         else:
             print(f"Table '{table_name}' did not exist")
@@ -209,36 +330,40 @@ def transform_gfg(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Transformed DataFrame ready for staging.
     """
-    # ID parsing
-    df['article_id'] = df['link'].str.split('/').str[-2]
+    # ID parsing: one regex match per link, no per-row list of path segments
+    df['article_id'] = df['link'].str.extract(_ARTICLE_ID_RE, expand=False)
 
-    # Date parsing
-    def parse_date(date_str):
-        if pd.isna(date_str):
-            return pd.NaT
-        try:
-            return pd.to_datetime(date_str, format='%d %b, %Y')
-        except:
-            return pd.NaT
-    
-    df['last_updated'] = df['last_updated'].apply(parse_date)
-    
-    # YYYY-MM-DD format for staging
-    df['last_updated_str'] = df['last_updated'].dt.strftime('%Y-%m-%d')
+    # Date parsing: GFG dates repeat heavily, so parse each distinct string once
+    # (unparseable -> NaT) and broadcast back through the factorize codes.
+    # The trailing NaT slot is what code -1 (missing value) picks up.
+    codes, uniques = pd.factorize(df['last_updated'])
+    parsed = pd.to_datetime(uniques, format='%d %b, %Y', errors='coerce')
+    lookup = np.append(parsed.to_numpy(), np.datetime64('NaT'))
+    df['last_updated'] = pd.Series(lookup[codes], index=df.index)
 
     return df[['article_id', 'title', 'author_id', 'last_updated', 'link', 'category']]
 
 
 def ingest_csv_to_db(csv_path: str, conn: sqlite3.Connection, table_name: str, 
-                     transform_func=None) -> bool:
+                     transform_func=None, chunksize: int = 50_000,
+                     max_workers: int = 4,
+                     writer: Optional['BackgroundWriter'] = None) -> bool:
     """
     Generic CSV ingestion with dynamic schema lookup and optional transforms.
 
+    The CSV is read in chunks; transforms run concurrently in a thread pool while
+    the calling thread stays the only SQLite writer. At most `max_workers` chunks
+    are in flight, so memory is bounded by a few chunks instead of the whole file.
+
     Args:
         csv_path (str): Path to input CSV file.
         conn (sqlite3.Connection): Active database connection.
         table_name (str): Target table name (must exist in SCHEMAS).
         transform_func (callable, optional): Transformation function(df) -> df.
+        chunksize (int, optional): Rows per CSV chunk. Defaults to 50_000.
+        max_workers (int, optional): Concurrent transform workers. Defaults to 4.
+        writer (BackgroundWriter, optional): Hand chunks to this background writer
+            instead of inserting on `conn`; rows are committed by the time it is closed.
 
     Returns:
         bool: True if ingestion succeeded, False otherwise.
@@ -254,15 +379,39 @@ def ingest_csv_to_db(csv_path: str, conn: sqlite3.Connection, table_name: str,
         if not create_table(conn, table_name, schema):
             return False
         
-        # Load and transform CSV
-        df = pd.read_csv(csv_path)
-        if transform_func:
-            df = transform_func(df)
-        
-        # Bulk insert (AUTOINCREMENT handles id)
-        insert_df_to_db(df, 'stg_gfg_articles', conn)
+        def write_chunk(df: pd.DataFrame) -> int:
+            # Bulk insert (AUTOINCREMENT handles id)
+            if writer is not None:
+                writer.put(df, table_name)
+            else:
+                insert_df_to_db_fast(df, table_name, conn)
+            return len(df)
+
+        transform = transform_func or (lambda df: df)
+
+        # Insert without per-row index maintenance, rebuild once at the end
+        # (a background writer does the same on its own connection)
+        if writer is None:
+            drop_indexes(conn, table_name)
+
+        # Load and transform CSV chunks (workers transform, this thread writes in order)
+        total_rows = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                pending = deque()
+                for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+                    pending.append(ex.submit(transform, chunk))
+                    if len(pending) >= max_workers:
+                        total_rows += write_chunk(pending.popleft().result())
+                while pending:
+                    total_rows += write_chunk(pending.popleft().result())
+        finally:
+            # Rebuild even if a chunk failed: already committed chunks stay indexed
+            if writer is None:
+                create_indexes(conn, table_name)
+                conn.commit()
         
-        print(f"Ingested {len(df)} rows into '{table_name}'")
+        print(f"{'Queued' if writer is not None else 'Ingested'} {total_rows} rows into '{table_name}'")
         return True
         
     except Exception as e:
@@ -285,47 +434,282 @@ def query_to_df(conn: sqlite3.Connection, statement: str, params: Optional[tuple
     return pd.read_sql_query(statement, conn, params=params)
 
 
+class ChunkedInsert:
+    """Context manager that buffers row dicts and writes them in fixed-size batches.
+
+    Rows are flushed with a single prepared INSERT via `executemany` whenever the
+    buffer reaches `chunksize`, and once more on exit, so memory stays bounded by
+    one chunk regardless of how many rows are streamed. The transaction is
+    committed on a clean exit and rolled back if the block raises, unless one was
+    already open on entry (e.g. `bulk_load`): then the enclosing block decides.
+
+    Args:
+        conn: Active SQLite database connection.
+        table_name: Target table name (must already exist).
+        columns: Column names, in the order values are bound.
+        chunksize: Rows buffered per flush. Defaults to SQLITE_MAX_VARIABLES // len(columns).
+
+    Example:
+        with ChunkedInsert(conn, 'dq_quarantine', ['source_table', 'pk_value']) as writer:
+            for pk in failed_pks:
+                writer.insert({'source_table': 'stg_gfg_articles', 'pk_value': pk})
+    """
+
+    def __init__(self, conn: sqlite3.Connection, table_name: str, columns: list,
+                 chunksize: Optional[int] = None):
+        self.conn = conn
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.chunksize = chunksize or max(1, SQLITE_MAX_VARIABLES // len(self.columns))
+        self.sql = (
+            f"INSERT INTO {table_name} ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' * len(self.columns))})"
+        )
+        self.rows_inserted = 0
+        self._buffer = []
+        # C-level field extraction: all columns in one call, missing keys defaulted to None
+        self._defaults = dict.fromkeys(self.columns)
+        getter = itemgetter(*self.columns)
+        self._row_values = getter if len(self.columns) > 1 else (lambda row: (getter(row),))
+
+    def __enter__(self) -> 'ChunkedInsert':
+        self._owns_transaction = not self.conn.in_transaction
+        return self
+
+    def insert(self, row: dict) -> None:
+        """Buffer one row (missing columns become NULL), flushing when the chunk is full."""
+        self._buffer.append(self._row_values({**self._defaults, **row}))
+        if len(self._buffer) >= self.chunksize:
+            self.flush()
+
+    def insert_many(self, rows) -> None:
+        """Buffer an iterable of row tuples (values in `columns` order), flushing as chunks fill."""
+        for row in rows:
+            self._buffer.append(tuple(row))
+            if len(self._buffer) >= self.chunksize:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows to the table."""
+        if not self._buffer:
+            return
+        self.conn.executemany(self.sql, self._buffer)
+        self.rows_inserted += len(self._buffer)
+        self._buffer = []
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.flush()
+            if self._owns_transaction:
+                self.conn.commit()
+        else:
+            self._buffer = []
+            if self._owns_transaction:
+                self.conn.rollback()
+        return False
+
+
 def insert_df_to_db(
     df: pd.DataFrame,
     table_name: str,
     conn,
-    chunksize: int = 500,
+    chunksize: int = 10_000,
     if_exists: str = 'append'
 ) -> None:
     """Inserts a pandas DataFrame into SQLite database table with chunking.
-    Uses `df.to_sql()` with optimized parameters to avoid SQLite's "too many SQL variables"
-    error on large DataFrames. Supports safe append operations while preserving table schema.
+    Only the schema step goes through pandas: `to_sql` on a zero-row frame creates,
+    replaces or empties the table according to `if_exists`. Rows are then bound to
+    one prepared INSERT via `executemany`, `chunksize` rows at a time, inside a
+    single explicit transaction. If the connection is already in a transaction
+    (e.g. `bulk_load`), the rows join it and the caller commits; note that
+    if_exists='replace' commits it during the schema step.
 
     Args:
         df: Input DataFrame to insert into database.
         table_name: Target table name in the database.
-        conn: SQLAlchemy connection or engine object.
-        chunksize: Number of rows per chunk (default: 500, safe for SQLite).
+        conn: Active sqlite3 connection.
+        chunksize: Number of rows per executemany batch. Defaults to 10_000.
         if_exists: What to do if table exists: {'fail', 'replace', 'append', 'delete_rows'}.
             Default is 'append' to preserve schema.
 
     Raises:
-        Exception: If insertion fails, falls back to single-row inserts.
+        ValueError: If the table exists and if_exists='fail'.
     """
-    try:
-        df.to_sql(
-            name=table_name,
-            con=conn,
-            if_exists=if_exists,
-            index=False,
-            method='multi',
-            chunksize=chunksize
-        )
-        print(f"Successfully inserted {len(df)} rows into '{table_name}'.")
-    except Exception as e:
-        print(f"Multi-insert failed for '{table_name}': {e}")
-        # Fallback: single-row inserts without method='multi'
-        df.to_sql(
-            name=table_name,
-            con=conn,
-            if_exists=if_exists,
-            index=False,
-            chunksize=chunksize
-        )
-        print(f"Fallback insert completed: {len(df)} rows into '{table_name}'.")
+    # Schema step only (no rows written): create / replace / empty per if_exists
+    df.head(0).to_sql(name=table_name, con=conn, if_exists=if_exists, index=False)
+
+    columns = ', '.join(df.columns)
+    placeholders = ', '.join('?' * len(df.columns))
+    sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+
+    # Plain Python scalars, None for missing values (sqlite3 can't bind numpy types / NaT)
+    values = df.astype(object).where(df.notna(), None)
+    batches = (
+        values.iloc[start:start + chunksize].itertuples(index=False, name=None)
+        for start in range(0, len(values), chunksize)
+    )
+
+    if conn.in_transaction:
+        # Caller's transaction (e.g. bulk_load): it commits or rolls back
+        for batch in batches:
+            conn.executemany(sql, batch)
+    else:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for batch in batches:
+                conn.executemany(sql, batch)
+    print(f"Successfully inserted {len(df)} rows into '{table_name}'.")
+
+
+def insert_df_to_db_fast(df: pd.DataFrame, table_name: str, conn: sqlite3.Connection) -> None:
+    """Inserts a pandas DataFrame into an existing SQLite table via raw `executemany`.
+    Bypasses pandas/SQLAlchemy statement building: one prepared INSERT is reused for
+    every row inside a single BEGIN IMMEDIATE transaction. Use it for plain tables created with
+    `create_table` (staging, quarantine); the table must already exist. If the connection
+    is already in a transaction (e.g. `bulk_load`), the rows join it and the caller commits.
+
+    Args:
+        df: Input DataFrame whose columns match the target table columns.
+        table_name: Target table name in the database.
+        conn: Active sqlite3 connection.
+    """
+    if df.empty:
+        print(f"Nothing to insert into '{table_name}'.")
+        return
+
+    columns = ', '.join(df.columns)
+    placeholders = ', '.join('?' * len(df.columns))
+    sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+
+    # Plain Python scalars, None for missing values (sqlite3 can't bind numpy types / NaT)
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+    if conn.in_transaction:
+        # Caller's transaction (e.g. bulk_load): it commits or rolls back
+        conn.executemany(sql, rows)
+    else:
+        with conn:
+            # Take the write lock up front instead of upgrading a deferred transaction
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(sql, rows)
+    print(f"Successfully inserted {len(df)} rows into '{table_name}'.")
+
+
+class BackgroundWriter:
+    """Single background thread that owns its own SQLite connection and performs all writes.
+
+    Callers hand DataFrames to `put()` and return immediately; the writer thread
+    buffers them per table and, once `batch_rows` rows are queued for a table,
+    concatenates them and commits the batch in one `insert_df_to_db_fast` call.
+    Secondary indexes of each written table are dropped on its first batch and
+    rebuilt once when the writer closes.
+    SQLite allows a single writer at a time, so exactly one thread is used. Call
+    `close()` (or leave the `with` block) before reading the written tables back.
+    After the first error the writer drains the queue without writing; it is kept
+    in `error`, `close()` returns False and leaving the `with` block raises.
 
+    Args:
+        db_path: Path to the database file (a separate connection is opened in the thread).
+        batch_rows: Rows per committed batch. Defaults to 10_000.
+        max_queued: Frames that may wait in the queue before `put()` blocks. Defaults to 8.
+
+    Example:
+        with BackgroundWriter('data/dg_articles.db') as writer:
+            writer.put(df, 'stg_gfg_articles')
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path: str, batch_rows: int = 10_000, max_queued: int = 8):
+        self.db_path = db_path
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def put(self, df: pd.DataFrame, table_name: str) -> None:
+        """Queue a DataFrame for insertion into an existing table."""
+        if not df.empty:
+            self._queue.put((table_name, df))
+
+    def close(self) -> bool:
+        """Flush everything still buffered, stop the thread and report success."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        return self.error is None
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        # A failed write must not pass silently; an exception already in flight wins
+        if not self.close() and exc_type is None:
+            raise RuntimeError(f"Background writer to '{self.db_path}' failed: {self.error}") from self.error
+        return False
+
+    def _fail(self, error: Exception, context: str) -> None:
+        """Record the first error; later frames are then drained without being written."""
+        if self.error is None:
+            self.error = error
+        print(f"Background writer {context} failed: {error}")
+
+    def _run(self) -> None:
+        conn = None
+        pending = {}
+        tables = set()
+
+        def flush(table_name: str) -> None:
+            frames = pending.pop(table_name, [])
+            if not frames or self.error is not None:
+                return
+            df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            insert_df_to_db_fast(df, table_name, conn)
+            self.rows_written += len(df)
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(f"PRAGMA {pragma}")
+        except Exception as e:
+            self._fail(e, f"setup for '{self.db_path}'")
+
+        # Keep draining the queue until close(), even after an error, so that
+        # producers never block on a dead writer
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            if self.error is not None:
+                continue
+            table_name, df = item
+            try:
+                if table_name not in tables:
+                    tables.add(table_name)
+                    drop_indexes(conn, table_name)
+                pending.setdefault(table_name, []).append(df)
+                if sum(map(len, pending[table_name])) >= self.batch_rows:
+                    flush(table_name)
+            except Exception as e:
+                self._fail(e, f"write to '{table_name}'")
+
+        if conn is None:
+            return
+        try:
+            for table_name in list(pending):
+                flush(table_name)
+        except Exception as e:
+            self._fail(e, f"write to '{table_name}'")
+        try:
+            # Rebuild dropped indexes even after a failure, keeping committed batches usable
+            if self.error is not None:
+                conn.rollback()
+            for table_name in tables:
+                create_indexes(conn, table_name)
+            conn.commit()
+        except Exception as e:
+            self._fail(e, "index rebuild")
+        finally:
+            conn.close()
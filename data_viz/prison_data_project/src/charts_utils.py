@@ -1,5 +1,29 @@
+import os
 import plotly.express as px
 import pandas as pd
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def _read_csv_cached(csv_path: str, mtime: float) -> pd.DataFrame:
+    """Parse a chart CSV once per (path, modification time)."""
+    return pd.read_csv(csv_path)
+
+
+def load_chart_data(csv_path: str) -> pd.DataFrame:
+    """
+    Loads a chart CSV, reusing the parsed frame while the file is unchanged.
+    
+    Charts built from the same CSV share one parse; editing the file changes its
+    mtime and triggers a fresh read. Callers must not mutate the returned frame.
+    
+    Args:
+        csv_path: Path to CSV
+    
+    Returns:
+        Parsed DataFrame (shared, read-only)
+    """
+    return _read_csv_cached(csv_path, os.path.getmtime(csv_path))
 
 
 def create_line_trends_plot(csv_path: str, x_col: str = 'YEAR', y_col: str = 'OCC_ABS', 
@@ -16,7 +40,7 @@ def create_line_trends_plot(csv_path: str, x_col: str = 'YEAR', y_col: str = 'OC
     Returns:
         Plotly Figure
     """
-    plot_data = pd.read_csv(csv_path)
+    plot_data = load_chart_data(csv_path)
     print(f"Data loaded: {len(plot_data)} rows")
     
     fig = px.line(
@@ -48,7 +72,7 @@ def create_simple_bar_plot(csv_path: str, x_col: str, y_col: str, color_col: str
     """
     Simple bar plot (eg. top10 occupancy).
     """
-    df = pd.read_csv(csv_path)
+    df = load_chart_data(csv_path)
     fig = px.bar(df, x=x_col, y=y_col, color=color_col, 
                 title=title, text=y_col)
     
@@ -65,12 +89,13 @@ def create_grouped_bar_comparison(csv_path: str, x_col: str = 'REGION', melt_id:
     """
     Grouped bar chart with values on bars.
     """
-    df = pd.read_csv(csv_path)
+    df = load_chart_data(csv_path)
     print(f"📊 Loaded {len(df)} regions: {df[x_col].tolist()}")
     
     df_long = df.melt(id_vars=melt_id, value_vars=melt_vars, 
                      var_name='Metric', value_name='Value')
-    df_long['Metric'] = df_long['Metric'].str.title()
+    # Few distinct metric names: title-case each once, then a hash lookup per row
+    df_long['Metric'] = df_long['Metric'].map({var: var.title() for var in melt_vars})
     df_long['ValueRounded'] = df_long['Value'].round(1)
     
     fig = px.bar(
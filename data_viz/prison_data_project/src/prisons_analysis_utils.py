@@ -1,51 +1,124 @@
+import os
+import numpy as np
 import pandas as pd
+from functools import lru_cache
+from pathlib import Path
 
 
-def load_and_clean_prison_data(filepath: str, max_year: int = 2022) -> pd.DataFrame:
+# Eurostat columns used by the analysis and their parse-time dtypes
+PRISON_CSV_DTYPES = {
+    'geo': 'category',
+    'unit': 'category',
+    'indic_cr': 'category',
+    'TIME_PERIOD': 'Int16',
+    'OBS_VALUE': 'float64',
+}
+
+# indic_cr labels of the two indicators occupancy is computed from
+PRISONERS_INDICATOR = "Actual number of persons held in prison"
+CAPACITY_INDICATOR = "Official prison capacity - persons"
+
+# Output column name parts: indic_cr -> prefix, unit -> suffix (e.g. PRISONERS_NUM)
+OCCUPANCY_PREFIXES = {PRISONERS_INDICATOR: "PRISONERS", CAPACITY_INDICATOR: "CAPACITY"}
+OCCUPANCY_SUFFIXES = {"Number": "NUM", "Per hundred thousand inhabitants": "100K"}
+
+# Index name set by prepare_by_year() (distinct from the YEAR column, which is kept)
+YEAR_INDEX = "YEAR_IDX"
+
+
+def load_and_clean_prison_data(filepath: str, max_year: int = 2022, chunksize: int = None,
+                               use_cache: bool = True, verbose: bool = True) -> pd.DataFrame:
     """
     Loads Eurostat prison statistics CSV, performs type casting and year filtering.
     
+    Parsed with the pyarrow CSV engine. Only the columns used by the analysis are
+    read, with their dtypes declared up front: low-cardinality text columns as
+    'category', year and value as numbers. For files too large to hold in memory,
+    pass chunksize: the CSV is then streamed in blocks and only rows with
+    YEAR <= max_year are kept from each, so peak memory is bounded by the block size.
+    
+    The cleaned result is saved as Parquet beside the CSV ('<name>.<max_year>.parquet')
+    and reused on later calls while it is newer than the CSV, skipping CSV parsing.
+    
     Args:
         filepath (str): Path to CSV file (e.g., 'crim_pris_cap-defaultview_linear.csv')
         max_year (int, optional): Maximum year to include. Defaults to 2022 (complete data).
+        chunksize (int, optional): Rows per block for a streamed read (e.g. 250_000).
+                                   Defaults to None (single multithreaded read).
+        use_cache (bool, optional): Read/write the Parquet cache. Defaults to True.
+        verbose (bool, optional): Print summary diagnostics. Defaults to True.
     
     Returns:
-        pd.DataFrame: Cleaned dataset with ALL original columns + numeric 'YEAR' and 'VALUE'
+        pd.DataFrame: Cleaned dataset with columns ['geo', 'unit', 'indic_cr', 'YEAR', 'VALUE']
         
         Columns include:
-        - 'geo': Country names
+        - 'geo': Country names (category)
         - 'YEAR': Numeric year (from TIME_PERIOD)
         - 'VALUE': Numeric values (from OBS_VALUE)
-        - 'unit', 'indic_cr', and all other original Eurostat columns
+        - 'unit', 'indic_cr': Eurostat unit and indicator labels (category)
     """
-    # Load raw CSV data
-    df = pd.read_csv(filepath, sep=',')
-    
-    # Type casting for numeric columns (handle parsing errors)
-    df['YEAR'] = pd.to_numeric(df['TIME_PERIOD'], errors='coerce')
-    df['VALUE'] = pd.to_numeric(df['OBS_VALUE'], errors='coerce')
-    
-    # Filter to complete years only (up to max_year)
-    df = df[df['YEAR'] <= max_year].copy()
-    
-    # Remove rows with missing critical YEAR data
-    df = df.dropna(subset=['YEAR'])
+    csv_path = Path(filepath)
+    cache = csv_path.with_suffix(f".{max_year}.parquet")
+    if use_cache and cache.exists() and cache.stat().st_mtime > csv_path.stat().st_mtime:
+        # Cleaned data already saved and up to date: columnar read, dtypes restored
+        df = pd.read_parquet(cache, engine='pyarrow')
+    else:
+        if chunksize:
+            # Streamed read (the pyarrow engine has no chunksize): filter years block by block
+            reader = pd.read_csv(
+                filepath, sep=',', chunksize=chunksize, low_memory=False,
+                usecols=list(PRISON_CSV_DTYPES), dtype=PRISON_CSV_DTYPES
+            )
+            df = pd.concat(chunk[chunk['TIME_PERIOD'] <= max_year] for chunk in reader)
+            # Blocks infer their own categories: re-encode the concatenated labels once
+            # (and match the pyarrow column order)
+            df = df[list(PRISON_CSV_DTYPES)].astype(PRISON_CSV_DTYPES)
+        else:
+            # Load only the needed columns, typed at parse time (multithreaded Arrow parser)
+            df = pd.read_csv(
+                filepath, sep=',', engine='pyarrow',
+                usecols=list(PRISON_CSV_DTYPES), dtype=PRISON_CSV_DTYPES
+            )
+        
+        # Numeric columns already typed: just give them their analysis names
+        df = df.rename(columns={'TIME_PERIOD': 'YEAR', 'OBS_VALUE': 'VALUE'})
+        
+        # Filter to complete years only (up to max_year)
+        df = df[df['YEAR'] <= max_year]
+        
+        # Remove rows with missing critical YEAR data
+        df = df.dropna(subset=['YEAR'])
+        
+        if use_cache:
+            try:
+                df.to_parquet(cache, compression='zstd', engine='pyarrow')
+            except OSError as e:
+                print(f"Could not write cache {cache}: {e}")
     
     # Summary statistics
-    n_rows, n_countries = len(df), df['geo'].nunique()
-    print(f"Loaded {n_rows:,} observations for {n_countries} countries (YEAR <= {max_year})")
-    print(f"Columns: {len(df.columns)} total | Sample: {df.columns.tolist()[:6]}...")
+    if verbose:
+        n_rows, n_countries = len(df), _n_countries(df)
+        print(f"Loaded {n_rows:,} observations for {n_countries} countries (YEAR <= {max_year})")
+        print(f"Columns: {len(df.columns)} total | Sample: {df.columns.tolist()[:6]}...")
     
     return df
 
 
-def compute_occupancy_rates(df_clean: pd.DataFrame) -> pd.DataFrame:
+def _occupancy_pct(prisoners: pd.Series, capacity: pd.Series) -> np.ndarray:
+    """Prisoners over capacity in %, rounded to 2 decimals (ufuncs on the raw arrays)."""
+    pct = np.divide(prisoners.to_numpy(), capacity.to_numpy())
+    np.multiply(pct, 100, out=pct)
+    return np.round(pct, out=pct, decimals=2)
+
+
+def compute_occupancy_rates(df_clean: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
     """
     Computes absolute and per-100k occupancy rates from raw Eurostat prison data.
     
     Args:
         df_clean (pd.DataFrame): Output from load_and_clean_prison_data()
                                 Must contain columns: ['geo', 'YEAR', 'unit', 'indic_cr', 'VALUE']
+        verbose (bool, optional): Print summary diagnostics. Defaults to True.
     
     Returns:
         pd.DataFrame: Final occupancy dataset with columns:
@@ -54,70 +127,142 @@ def compute_occupancy_rates(df_clean: pd.DataFrame) -> pd.DataFrame:
         - All occupancy rates rounded to 2 decimals
         - Only complete observations (non-null numerators/denominators)
     """
-    # 1) ABSOLUTE NUMBERS (Number unit)
-    df_num = df_clean[df_clean["unit"] == "Number"].copy()
-    
-    pivot_num = df_num.pivot_table(
-        index=["geo", "YEAR"],
-        columns="indic_cr",
-        values="VALUE",
-        aggfunc="first"
+    # Keep only the two occupancy indicators and the two units (exact-label hash lookups, no regex)
+    df_clean = df_clean[
+        df_clean["indic_cr"].isin(tuple(OCCUPANCY_PREFIXES))
+        & df_clean["unit"].isin(tuple(OCCUPANCY_SUFFIXES))
+    ]
+    
+    # One groupby for both units and both indicators, unstacked to one wide row per (geo, YEAR)
+    occupancy = (
+        df_clean.groupby(["geo", "YEAR", "unit", "indic_cr"], observed=True)["VALUE"]
+        .first()
+        .unstack(["unit", "indic_cr"])
     )
+    occupancy.columns = [
+        f"{OCCUPANCY_PREFIXES[indic]}_{OCCUPANCY_SUFFIXES[unit]}" for unit, indic in occupancy.columns
+    ]
+    occupancy = occupancy.reindex(columns=["PRISONERS_NUM", "CAPACITY_NUM", "PRISONERS_100K", "CAPACITY_100K"])
     
-    pivot_num = pivot_num.rename(columns={
-        "Actual number of persons held in prison": "PRISONERS_NUM",
-        "Official prison capacity - persons": "CAPACITY_NUM"
-    })
+    # Keep only complete rows (both units, both indicators)
+    occupancy = occupancy.dropna()
     
-    # Keep only complete rows
-    pivot_num = pivot_num.dropna(subset=["PRISONERS_NUM", "CAPACITY_NUM"])
+    # Absolute and per-100k occupancy (%)
+    occupancy.insert(2, "OCC_ABS", _occupancy_pct(occupancy["PRISONERS_NUM"], occupancy["CAPACITY_NUM"]))
+    occupancy["OCC_PER_100K"] = _occupancy_pct(occupancy["PRISONERS_100K"], occupancy["CAPACITY_100K"])
     
-    # Absolute occupancy (%)
-    pivot_num["OCC_ABS"] = (pivot_num["PRISONERS_NUM"] / pivot_num["CAPACITY_NUM"] * 100).round(2)
+    # Final dataframe
+    occupancy_df = occupancy.reset_index()
     
-    # 2) PER 100K INHABITANTS
-    df_100k = df_clean[df_clean["unit"] == "Per hundred thousand inhabitants"].copy()
+    # Info
+    if verbose:
+        n_rows, n_countries = len(occupancy_df), _n_countries(occupancy_df)
+        print(f"Occupancy dataset: {n_rows} observations, {n_countries} countries")
+        print(f"Years: {occupancy_df['YEAR'].min()} → {occupancy_df['YEAR'].max()}")
+        print("Columns:", occupancy_df.columns.tolist())
     
-    pivot_100k = df_100k.pivot_table(
-        index=["geo", "YEAR"],
-        columns="indic_cr",
-        values="VALUE",
-        aggfunc="first"
-    )
+    return occupancy_df
+
+
+@lru_cache(maxsize=4)
+def _occupancy_cached(filepath: str, mtime: float, max_year: int) -> pd.DataFrame:
+    """Load and pivot a prison CSV once per (path, modification time, max_year)."""
+    return compute_occupancy_rates(load_and_clean_prison_data(filepath, max_year))
+
+
+def get_occupancy(filepath: str, max_year: int = 2022) -> pd.DataFrame:
+    """
+    Loads the occupancy dataset for a prison CSV, reusing it while the file is unchanged.
+    
+    Equivalent to compute_occupancy_rates(load_and_clean_prison_data(filepath, max_year)),
+    but the result is cached on the file's mtime: analyses that start from the same CSV
+    share one load and pivot, and editing the file triggers a fresh computation.
+    Callers must not mutate the returned frame.
     
-    pivot_100k = pivot_100k.rename(columns={
-        "Actual number of persons held in prison": "PRISONERS_100K",
-        "Official prison capacity - persons": "CAPACITY_100K"
-    })
+    Args:
+        filepath (str): Path to CSV file (see load_and_clean_prison_data)
+        max_year (int, optional): Maximum year to include. Defaults to 2022 (complete data).
     
-    # Keep only complete rows
-    pivot_100k = pivot_100k.dropna(subset=["PRISONERS_100K", "CAPACITY_100K"])
+    Returns:
+        pd.DataFrame: Occupancy dataset as returned by compute_occupancy_rates() (shared, read-only)
+    """
+    return _occupancy_cached(filepath, os.path.getmtime(filepath), max_year)
+
+
+def prepare_by_year(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Indexes an occupancy dataframe by year for repeated per-year queries.
     
-    # Per-100k occupancy (%)
-    pivot_100k["OCC_PER_100K"] = (pivot_100k["PRISONERS_100K"] / pivot_100k["CAPACITY_100K"] * 100).round(2)
+    over_100_occupancy, top_worst_countries and compare_regions accept the result in
+    place of the plain frame: each year is then a binary-search slice of the sorted
+    index instead of a full scan of the YEAR column. Row order within a year is kept.
     
-    # 3) MERGE BOTH VERSIONS
-    occupancy = pivot_num.join(pivot_100k, how="inner")
+    Args:
+        df (pd.DataFrame): Input dataframe with a 'YEAR' column (e.g. compute_occupancy_rates() output)
     
-    # Final dataframe
-    occupancy_df = occupancy.reset_index()
+    Returns:
+        pd.DataFrame: Same rows and columns, sorted by YEAR and indexed by it (index named YEAR_INDEX)
     
-    # Info
-    n_rows, n_countries = len(occupancy_df), occupancy_df['geo'].nunique()
-    print(f"Occupancy dataset: {n_rows} observations, {n_countries} countries")
-    print(f"Years: {occupancy_df['YEAR'].min()} → {occupancy_df['YEAR'].max()}")
-    print("Columns:", occupancy_df.columns.tolist())
+    Example:
+        occ_by_year = prepare_by_year(occupancy_df)
+        for year in range(2010, 2023):
+            over_100_occupancy(occ_by_year, year)
+    """
+    return df.set_index(df["YEAR"].rename(YEAR_INDEX)).sort_index(kind="stable")
+
+
+def _rows_for_year(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """Rows of one year: index slice on prepare_by_year() output, boolean mask otherwise."""
+    if df.index.name == YEAR_INDEX:
+        return df.loc[year:year]
+    return df[df["YEAR"] == year]
+
+
+def _geo_mask(df: pd.DataFrame, countries: list) -> np.ndarray:
+    """Boolean row mask for geo in countries; integer code match when geo is categorical."""
+    geo = df["geo"]
+    if isinstance(geo.dtype, pd.CategoricalDtype):
+        target_codes = geo.cat.categories.get_indexer(countries)
+        return np.isin(geo.cat.codes.to_numpy(), target_codes[target_codes >= 0])
+    return geo.isin(countries).to_numpy()
+
+
+def _n_countries(df: pd.DataFrame) -> int:
+    """Number of distinct geo values; counted on the category codes when geo is categorical."""
+    geo = df["geo"]
+    if isinstance(geo.dtype, pd.CategoricalDtype):
+        codes = geo.cat.codes.to_numpy()
+        return int(np.count_nonzero(np.bincount(codes[codes >= 0])))
+    return geo.nunique()
+
+
+def _smallest_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Positions of the n smallest values, like Series.nsmallest(n) (NaN skipped, ties keep first).
     
-    return occupancy_df
+    Linear-time selection with np.partition instead of sorting the whole array.
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    values = values[valid]
+    k = min(n, len(values))
+    if k == 0:
+        return valid[:0]
+    
+    # k-th smallest value: everything below it is in, ties at it fill the rest in row order
+    kth = np.partition(values, k - 1)[k - 1]
+    below = np.flatnonzero(values < kth)
+    ties = np.flatnonzero(values == kth)[:k - len(below)]
+    return valid[np.concatenate([below, ties])]
 
 
-def over_100_occupancy(df: pd.DataFrame, year: int) -> pd.DataFrame:
+def over_100_occupancy(df: pd.DataFrame, year: int, verbose: bool = True) -> pd.DataFrame:
     """
     Identifies countries with occupancy rate > 100% in the target year and extracts their time trends.
     
     Args:
         df (pd.DataFrame): Input dataframe with columns ['geo', 'YEAR', 'OCC_ABS']
         year (int): Target year for filtering countries above 100%
+        verbose (bool, optional): Print summary diagnostics. Defaults to True.
     
     Returns:
         pd.DataFrame: Trends dataframe with columns ['geo', 'YEAR', 'OCC_ABS'] for overcrowded countries,
@@ -128,28 +273,28 @@ def over_100_occupancy(df: pd.DataFrame, year: int) -> pd.DataFrame:
         trends.to_csv('overcrowded_trends.csv', index=False)
     """
     # Filter target year
-    df_year = df[df["YEAR"] == year].copy()
+    df_year = _rows_for_year(df, year)
 
     # Countries above 100% in that year
     over = df_year[df_year["OCC_ABS"] > 100]
 
-    n_over = over["geo"].nunique()
-    n_total = df_year["geo"].nunique()
-
-    print(f"Number of countries with occupancy above 100% in {year}: {n_over} out of {n_total}")
+    if verbose:
+        n_over = _n_countries(over)
+        n_total = _n_countries(df_year)
+        print(f"Number of countries with occupancy above 100% in {year}: {n_over} out of {n_total}")
 
     # Time series for those overcrowded countries (for plotting)
-    over_countries = over["geo"].unique().tolist()
+    over_countries = over["geo"].unique()
     trends = (
-        df[df["geo"].isin(over_countries)][["geo", "YEAR", "OCC_ABS"]]
-        .sort_values(["geo", "YEAR"])
-        .reset_index(drop=True)
+        df.loc[_geo_mask(df, over_countries), ["geo", "YEAR", "OCC_ABS"]]
+        .sort_values(["geo", "YEAR"], kind="stable", ignore_index=True)
     )
 
     return trends
 
 
-def top_worst_countries(df: pd.DataFrame, year: int, n: int = 10, direction: str = "top"):
+def top_worst_countries(df: pd.DataFrame, year: int, n: int = 10, direction: str = "top",
+                        verbose: bool = True):
     """
     Selects top-N or worst-N countries by occupancy rate in target year and extracts their time trends.
     
@@ -159,6 +304,7 @@ def top_worst_countries(df: pd.DataFrame, year: int, n: int = 10, direction: str
         n (int, optional): Number of extreme countries to select. Defaults to 10.
         direction (str, optional): "top" for highest OCC_ABS (overcrowded), "worst" for lowest OCC_ABS (underutilized).
                                    Defaults to "top".
+        verbose (bool, optional): Print summary diagnostics. Defaults to True.
     
     Returns:
         pd.DataFrame: Trends dataframe with columns ['geo', 'YEAR', 'OCC_ABS'] for extreme countries,
@@ -173,37 +319,39 @@ def top_worst_countries(df: pd.DataFrame, year: int, n: int = 10, direction: str
         top10_trends.to_csv('top10_occupancy_trends.csv', index=False)
     """
     # Filter target year
-    df_year = df[df["YEAR"] == year].copy()
+    df_year = _rows_for_year(df, year)
     
     # Validate direction
     if direction not in ["top", "worst"]:
         raise ValueError('direction must be "worst" (highest OCC_ABS) or "top" (lowest OCC_ABS)')
     
-    # Select top-N or worst-N countries by OCC_ABS
+    # Select top-N or worst-N countries by OCC_ABS (partial selection, no full sort)
+    occ = df_year["OCC_ABS"].to_numpy(dtype="float64", na_value=np.nan)
     if direction == "worst":
-        extreme_countries = df_year.nlargest(n, "OCC_ABS")["geo"].unique().tolist()
+        positions = _smallest_positions(-occ, n)
         extreme_label = "worst"
     else:
-        extreme_countries = df_year.nsmallest(n, "OCC_ABS")["geo"].unique().tolist()
+        positions = _smallest_positions(occ, n)
         extreme_label = "top"
+    extreme_countries = df_year["geo"].iloc[positions].unique()
     
-    n_extreme = len(extreme_countries)
-    n_total = df_year["geo"].nunique()
-    
-    print(f"Number of {extreme_label} {n} occupancy countries in {year}: {n_extreme} out of {n_total}")
+    if verbose:
+        n_extreme = len(extreme_countries)
+        n_total = _n_countries(df_year)
+        print(f"Number of {extreme_label} {n} occupancy countries in {year}: {n_extreme} out of {n_total}")
     
     # Time series for those extreme countries (for plotting trends)
     extreme_trends = (
-        df[df["geo"].isin(extreme_countries)][["geo", "YEAR", "OCC_ABS"]]
-        .sort_values(["geo", "YEAR"])
-        .reset_index(drop=True)
+        df.loc[_geo_mask(df, extreme_countries), ["geo", "YEAR", "OCC_ABS"]]
+        .sort_values(["geo", "YEAR"], kind="stable", ignore_index=True)
     )
     
     # columns outcome: geo, YEAR, OCC_ABS
     return extreme_trends
 
 
-def compare_regions(df: pd.DataFrame, region1, region2, year: int) -> pd.DataFrame:
+def compare_regions(df: pd.DataFrame, region1, region2, year: int, verbose: bool = True,
+                    include_other: bool = True) -> pd.DataFrame:
     """
     Compares occupancy statistics between regions for target year.
     
@@ -212,6 +360,9 @@ def compare_regions(df: pd.DataFrame, region1, region2, year: int) -> pd.DataFra
         region1 (str/list): North countries
         region2 (str/list): South countries  
         year (int): Target year
+        verbose (bool, optional): Print the stats table. Defaults to True.
+        include_other (bool, optional): Keep countries in neither region as an "Other" row.
+                                        False drops their rows before any labelling. Defaults to True.
     
     Returns:
         pd.DataFrame: Flat table with columns ['REGION', 'mean', 'min', 'max', 'count']
@@ -221,42 +372,47 @@ def compare_regions(df: pd.DataFrame, region1, region2, year: int) -> pd.DataFra
     north_countries = [c.strip() for c in (region1.split(",") if isinstance(region1, str) else region1)]
     south_countries = [c.strip() for c in (region2.split(",") if isinstance(region2, str) else region2)]
     
-    def assign_region(country):
-        if country in north_countries: return "North"
-        if country in south_countries: return "South" 
-        return "Other"
-    
-    # Assign regions
-    df_assigned = df.copy()
-    df_assigned["REGION"] = df_assigned["geo"].apply(assign_region)
-    
     # Filter target year
-    latest = df_assigned[df_assigned["YEAR"] == year].copy()
+    latest = _rows_for_year(df, year)
+    
+    # Assign regions on the year slice only, vectorized (no per-row Python call)
+    in_north = _geo_mask(latest, north_countries)
+    in_south = _geo_mask(latest, south_countries)
+    if include_other:
+        region = np.select([in_north, in_south], ["North", "South"], default="Other")
+        latest = latest[["OCC_ABS"]]
+    else:
+        # Region members only: "Other" rows are dropped instead of labelled
+        members = in_north | in_south
+        region = np.where(in_north[members], "North", "South")
+        latest = latest.loc[members, ["OCC_ABS"]]
+    latest = latest.assign(REGION=pd.Categorical(region))
     
     # Groupby with REGION as column (not index!)
     region_stats = (
-        latest.groupby("REGION", as_index=False)["OCC_ABS"]  # ✅ as_index=False!
+        latest.groupby("REGION", as_index=False, observed=True)["OCC_ABS"]  # ✅ as_index=False!
         .agg(["mean", "min", "max", "count"])
         .round(2)
-        .reset_index(drop=True)  # Pulizia finale
     )
     
     # Flatten column names (optional, cleaner)
     region_stats.columns = ['REGION', 'mean', 'min', 'max', 'count']
     
-    print(f"Region stats for {year}:")
-    print(region_stats)
+    if verbose:
+        print(f"Region stats for {year}:")
+        print(region_stats)
     
     return region_stats
 
 
-def trend_nations(df: pd.DataFrame, countries_focus: list) -> pd.DataFrame:
+def trend_nations(df: pd.DataFrame, countries_focus: list, verbose: bool = True) -> pd.DataFrame:
     """
     Extracts time trends for a specific list of focus countries.
     
     Args:
         df (pd.DataFrame): Input dataframe with columns ['geo', 'YEAR', 'OCC_ABS']
         countries_focus (list): List of country names to extract trends for
+        verbose (bool, optional): Print summary diagnostics. Defaults to True.
         
     Returns:
         pd.DataFrame: Trends dataframe with columns ['geo', 'YEAR', 'OCC_ABS'] for focus countries,
@@ -267,12 +423,13 @@ def trend_nations(df: pd.DataFrame, countries_focus: list) -> pd.DataFrame:
         focus_trends.to_csv('focus_countries_trends.csv', index=False)
     """
     
-    focus_trends = df[df["geo"].isin(countries_focus)][["geo", "YEAR", "OCC_ABS"]].copy()
+    focus_trends = df.loc[_geo_mask(df, countries_focus), ["geo", "YEAR", "OCC_ABS"]]
     
-    n_countries = focus_trends["geo"].nunique()
-    print(f"Trends extracted for {n_countries} focus countries: {countries_focus}")
+    if verbose:
+        n_countries = _n_countries(focus_trends)
+        print(f"Trends extracted for {n_countries} focus countries: {countries_focus}")
     
-    focus_trends = focus_trends.sort_values(["geo", "YEAR"]).reset_index(drop=True)
+    focus_trends = focus_trends.sort_values(["geo", "YEAR"], kind="stable", ignore_index=True)
     
     # columns outcome: geo, YEAR, OCC_ABS
     return focus_trends